@@ -1,47 +1,169 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Request, Depends
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, FileResponse, JSONResponse, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.datastructures import Headers, MutableHeaders
 import os
+import sys
 import logging
 import uuid
 import asyncio
+import bisect
+import codecs
+import contextlib
+import contextvars
+import hashlib
+import heapq
+import json
+import importlib
 import io
-import csv
+import math
+import mimetypes
 import re
 import time
 from pathlib import Path
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from typing import List, Optional
 from datetime import datetime, timezone
-from collections import defaultdict
-import bcrypt
-import jwt
-import bleach
-import resend
+from collections import defaultdict, deque, OrderedDict
+from storage import open_storage
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+
+# ─── Lazy Imports ─────────────────────────────────────────
+# Render spins the instance down when idle, so every import paid at module
+# load is paid again by the first visitor. Admin-only and email-only
+# dependencies are imported on first attribute access instead.
+class LazyModule:
+    def __init__(self, name: str, on_load=None):
+        self._name = name
+        self._on_load = on_load
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            if self._on_load:
+                self._on_load(module)
+            self._module = module
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+def _configure_resend(module):
+    module.api_key = os.environ.get('RESEND_API_KEY')
+
+
+bcrypt = LazyModule("bcrypt")
+jwt = LazyModule("jwt")
+bleach = LazyModule("bleach")
+resend = LazyModule("resend", on_load=_configure_resend)
+
+
+# Storage (MongoDB by default; STORAGE_BACKEND=sqlite runs without a server).
+# The Mongo client is created on first use, not at import.
+storage = open_storage()
 
 # JWT Secret for admin auth
 JWT_SECRET = os.environ.get('JWT_SECRET')
 
 # Resend configuration
-resend.api_key = os.environ.get('RESEND_API_KEY')
 SENDER_EMAIL = os.environ.get('SENDER_EMAIL', 'onboarding@resend.dev')
 ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL', 'chiluverushivaprasad02@gmail.com')
 
+# Export jobs
+EXPORT_DIR = Path(os.environ.get('EXPORT_DIR', ROOT_DIR / 'exports'))
+EXPORT_RETENTION = int(os.environ.get('EXPORT_RETENTION', 20))
+EXPORT_FIELDS = [
+    "id", "full_name", "email", "phone", "service", "project_deadline",
+    "project_description", "website_type", "platform", "video_type",
+    "design_type", "status", "created_at", "updated_at",
+]
+export_jobs = {}
+
+# Spam filtering
+SPAM_BLOCKLIST_PATH = Path(os.environ.get('SPAM_BLOCKLIST_PATH', ROOT_DIR / 'spam_blocklist.txt'))
+SPAM_FILTER_CAPACITY = int(os.environ.get('SPAM_FILTER_CAPACITY', 100000))
+SPAM_FILTER_ERROR_RATE = 0.001
+SPAM_SCORE_THRESHOLD = 10
+REPUTATION_TTL = 3600
+DUPLICATE_WINDOW = 3600
+DUPLICATE_MAX = 10  # per sender per window; only abusive repetition
+DUPLICATE_MAX_SENDERS = 3  # distinct senders of one description per window
+MAX_LINKS = 5
+ip_reputation = {}
+recent_descriptions = {}
+spam_blocklist = set()
+spam_stats = defaultdict(int)
+
+# Tracing
+TRACE_LOG_PATH = Path(os.environ.get('TRACE_LOG_PATH', ROOT_DIR / 'traces.jsonl'))
+TRACE_SLOWEST_N = int(os.environ.get('TRACE_SLOWEST_N', 10))
+TRACE_LOG_WINDOW = int(os.environ.get('TRACE_LOG_WINDOW', 60))
+
+# Admission control: route class -> (concurrency, queue size, queue timeout s).
+# Non-booking limits stay well under the Mongo pool so bookings keep headroom;
+# bookings are queued without bound and never shed.
+ADMISSION_CLASSES = {
+    "booking": (int(os.environ.get('BOOKING_CONCURRENCY', 32)), None, None),
+    "login": (int(os.environ.get('LOGIN_CONCURRENCY', 2)), 4, 2.0),
+    "bulk": (int(os.environ.get('BULK_CONCURRENCY', 1)), 2, 5.0),
+    "admin": (int(os.environ.get('ADMIN_CONCURRENCY', 8)), 16, 5.0),
+    "status": (int(os.environ.get('STATUS_CONCURRENCY', 16)), 32, 1.0),
+}
+
+# Recent bookings cache
+RECENT_CACHE_SIZE = int(os.environ.get('RECENT_CACHE_SIZE', 5000))
+RECENT_CACHE_WARM_ATTEMPTS = 8
+RECENT_CACHE_WARM_BACKOFF = 1.0  # seconds, doubled per attempt
+RECENT_CACHE_WARM_MAX_DELAY = 30.0
+ADMIN_LIST_LIMIT = 1000
+
+# Bulk import
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 500))
+IMPORT_MAX_RECORD_BYTES = 1024 * 1024
+IMPORT_MAX_ERRORS = 50
+# Rows without an id get one derived from their content, so a re-import maps
+# to the same booking instead of a new one
+IMPORT_ID_NAMESPACE = uuid.UUID("90b42d93-357f-4c78-9681-df15736591ea")
+
+# Frontend build served from this origin (optional; unset = API only)
+FRONTEND_BUILD_DIR = os.environ.get('FRONTEND_BUILD_DIR')
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+STATIC_CACHE = "public, max-age=3600"
+
 # Rate limiting storage
-rate_limit_store = defaultdict(list)
+class RateLimitStore(defaultdict):
+    """Request timestamps per client key. Keys come from X-Forwarded-For, so
+    idle ones are swept once per window instead of kept forever."""
+
+    def __init__(self):
+        super().__init__(list)
+        self.last_sweep = time.time()
+
+    def sweep(self, now: float, window: int):
+        self.last_sweep = now
+        for key in [k for k, hits in self.items() if not hits or now - hits[-1] >= window]:
+            del self[key]
+
+rate_limit_store = RateLimitStore()
 RATE_LIMIT_WINDOW = 60
 RATE_LIMIT_MAX = 5
 
+# Public status lookups: own rate-limit budget and a short-lived cache
+status_rate_limit_store = RateLimitStore()
+STATUS_RATE_LIMIT_MAX = int(os.environ.get('STATUS_RATE_LIMIT_MAX', 60))
+STATUS_CACHE_SIZE = int(os.environ.get('STATUS_CACHE_SIZE', 2048))
+STATUS_CACHE_TTL = int(os.environ.get('STATUS_CACHE_TTL', 30))
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -71,6 +193,18 @@ class AdminLogin(BaseModel):
 class StatusUpdate(BaseModel):
     status: str
 
+class BulkDelete(BaseModel):
+    ids: List[str]
+    spam: bool = False
+
+class BlocklistUpdate(BaseModel):
+    emails: List[str] = []
+    domains: List[str] = []
+    ips: List[str] = []
+
+class ExportCreate(BaseModel):
+    since: Optional[str] = None  # cursor returned by a previous export
+
 
 # ─── Helpers ──────────────────────────────────────────────
 def sanitize(text: str) -> str:
@@ -78,20 +212,258 @@ def sanitize(text: str) -> str:
         return ""
     return bleach.clean(text.strip(), tags=[], strip=True)
 
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+REQUIRED_FIELDS = ("full_name", "email", "phone", "project_description")
+VALID_STATUSES = ["New", "Contacted", "In Progress", "Completed"]
+
+def build_booking(data: BookingCreate, booking_id: str, ip: Optional[str]) -> dict:
+    """Sanitized booking document as stored in the DB"""
+    return {
+        "id": booking_id,
+        "full_name": sanitize(data.full_name),
+        "email": sanitize(data.email),
+        "phone": sanitize(data.phone),
+        "service": sanitize(data.service),
+        "project_deadline": sanitize(data.project_deadline) if data.project_deadline else None,
+        "project_description": sanitize(data.project_description),
+        "website_type": sanitize(data.website_type) if data.website_type else None,
+        "platform": sanitize(data.platform) if data.platform else None,
+        "video_type": sanitize(data.video_type) if data.video_type else None,
+        "design_type": sanitize(data.design_type) if data.design_type else None,
+        "status": "New",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "ip_address": ip
+    }
+
+def to_utc_isoformat(value: str) -> str:
+    """Normalize an ISO timestamp to UTC; naive values are taken as UTC"""
+    parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+def missing_required_fields(booking: dict) -> List[str]:
+    return [f for f in REQUIRED_FIELDS if not booking.get(f)]
+
 def get_client_ip(request: Request) -> str:
     forwarded = request.headers.get("x-forwarded-for")
     if forwarded:
         return forwarded.split(",")[0].strip()
     return request.client.host if request.client else "unknown"
 
-def check_rate_limit(ip: str) -> bool:
+def check_rate_limit(ip: str, store=rate_limit_store, limit: int = RATE_LIMIT_MAX, window: int = RATE_LIMIT_WINDOW) -> bool:
     now = time.time()
-    rate_limit_store[ip] = [t for t in rate_limit_store[ip] if now - t < RATE_LIMIT_WINDOW]
-    if len(rate_limit_store[ip]) >= RATE_LIMIT_MAX:
+    if now - store.last_sweep >= window:
+        store.sweep(now, window)
+    store[ip] = [t for t in store[ip] if now - t < window]
+    if len(store[ip]) >= limit:
         return False
-    rate_limit_store[ip].append(now)
+    store[ip].append(now)
     return True
 
+class TTLCache:
+    """Small LRU cache whose entries also expire after ``ttl`` seconds"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self.data.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self.data[key]
+            return default
+        self.data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self.data[key] = (value, time.monotonic() + self.ttl)
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def invalidate(self, key):
+        self.data.pop(key, None)
+
+# ─── Spam Filter ──────────────────────────────────────────
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> bool:
+        added = False
+        for pos in self._positions(item):
+            if not self.bits[pos >> 3] & (1 << (pos & 7)):
+                self.bits[pos >> 3] |= 1 << (pos & 7)
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+# The blocklist file (one "email:..." or "domain:..." key per line) is the
+# source of truth. Bloom filters can't drop entries, so the filter is rebuilt
+# from it on load and on removal. IPs are never blocklisted: they come from
+# X-Forwarded-For, so they only get a TTL reputation score.
+_spam_filter: Optional[BloomFilter] = None
+_blocklist_lock = asyncio.Lock()
+
+def read_blocklist(path: Path) -> set:
+    with open(path, encoding="utf-8") as f:
+        keys = {line.strip() for line in f}
+    return {k for k in keys if k.startswith(("email:", "domain:"))}
+
+def write_blocklist(path: Path, keys: set):
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(f"{key}\n" for key in sorted(keys))
+    os.replace(tmp, path)
+
+def build_spam_filter(keys: set) -> BloomFilter:
+    bloom = BloomFilter(max(SPAM_FILTER_CAPACITY, len(keys)), SPAM_FILTER_ERROR_RATE)
+    for key in keys:
+        bloom.add(key)
+    return bloom
+
+def load_spam_filter() -> BloomFilter:
+    global _spam_filter, spam_blocklist
+    try:
+        spam_blocklist = read_blocklist(SPAM_BLOCKLIST_PATH)
+        logger.info(f"🛡️ Spam blocklist loaded: {len(spam_blocklist)} entries")
+    except FileNotFoundError:
+        spam_blocklist = set()
+    except Exception as e:
+        logger.error(f"❌ Failed to load spam blocklist, starting empty: {str(e)}")
+        spam_blocklist = set()
+    _spam_filter = build_spam_filter(spam_blocklist)
+    return _spam_filter
+
+def get_spam_filter() -> BloomFilter:
+    return _spam_filter if _spam_filter is not None else load_spam_filter()
+
+def blocklist_keys(email: str = "", domain: str = "") -> List[str]:
+    email = (email or "").strip().lower()
+    domain = (domain or (email.rpartition("@")[2] if "@" in email else "")).strip().lower()
+    keys = []
+    if email:
+        keys.append(f"email:{email}")
+    if domain:
+        keys.append(f"domain:{domain}")
+    return keys
+
+def get_ip_reputation(ip: str) -> int:
+    entry = ip_reputation.get(ip)
+    if not entry:
+        return 0
+    score, expires_at = entry
+    if time.time() >= expires_at:
+        del ip_reputation[ip]
+        return 0
+    return score
+
+def penalize_ip(ip: str, points: int):
+    now = time.time()
+    ip_reputation[ip] = (get_ip_reputation(ip) + points, now + REPUTATION_TTL)
+    if len(ip_reputation) > 10000:
+        for key in [k for k, (_, exp) in ip_reputation.items() if exp <= now]:
+            del ip_reputation[key]
+
+def _description_key(text: str) -> Optional[bytes]:
+    normalized = " ".join(text.lower().split())
+    if len(normalized) < 20:
+        return None
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+
+def description_counts(text: str, sender: str) -> tuple:
+    """(bookings from this sender, distinct senders) that used the
+    description among accepted bookings in the window"""
+    key = _description_key(text)
+    entry = recent_descriptions.get(key) if key is not None else None
+    if entry is None or entry[1] <= time.time():
+        return 0, 0
+    senders = entry[0]
+    return senders.get(sender.strip().lower(), 0), len(senders)
+
+def record_description(text: str, sender: str):
+    """Count an accepted booking's description against its sender"""
+    key = _description_key(text)
+    if key is None:
+        return
+    now = time.time()
+    entry = recent_descriptions.get(key)
+    senders = entry[0] if entry is not None and entry[1] > now else {}
+    sender = sender.strip().lower()
+    senders[sender] = senders.get(sender, 0) + 1
+    recent_descriptions[key] = (senders, now + DUPLICATE_WINDOW)
+    if len(recent_descriptions) > 10000:
+        for k in [k for k, (_, exp) in recent_descriptions.items() if exp <= now]:
+            del recent_descriptions[k]
+
+# One match per URL, so "https://www.example.com" counts once
+LINK_RE = re.compile(r'(?:https?://|www\.)\S+', re.IGNORECASE)
+
+def early_spam_check(data: BookingCreate, ip: str) -> Optional[str]:
+    """Cheap pre-sanitization spam screen; returns a rejection reason or None"""
+    if get_ip_reputation(ip) >= SPAM_SCORE_THRESHOLD:
+        return "ip_reputation"
+
+    bloom = get_spam_filter()
+    if any(key in bloom for key in blocklist_keys(email=data.email)):
+        return "blocklist"
+
+    # Links to the client's own site are normal; only a link dump is spam
+    text = data.project_description or ""
+    if len(LINK_RE.findall(text)) > MAX_LINKS:
+        return "too_many_links"
+
+    # A client retrying is one sender; a bot rotating emails is many
+    sent, senders = description_counts(text, data.email)
+    if sent >= DUPLICATE_MAX or (not sent and senders >= DUPLICATE_MAX_SENDERS):
+        return "duplicate_description"
+
+    return None
+
+async def add_to_blocklist(keys: List[str]) -> int:
+    async with _blocklist_lock:
+        bloom = get_spam_filter()
+        new = set(keys) - spam_blocklist
+        if new:
+            spam_blocklist.update(new)
+            for key in new:
+                bloom.add(key)
+            await asyncio.to_thread(write_blocklist, SPAM_BLOCKLIST_PATH, set(spam_blocklist))
+        return len(new)
+
+async def remove_from_blocklist(keys: List[str]) -> int:
+    global _spam_filter
+    async with _blocklist_lock:
+        get_spam_filter()
+        gone = spam_blocklist.intersection(keys)
+        if gone:
+            spam_blocklist.difference_update(gone)
+            await asyncio.to_thread(write_blocklist, SPAM_BLOCKLIST_PATH, set(spam_blocklist))
+            _spam_filter = await asyncio.to_thread(build_spam_filter, set(spam_blocklist))
+        return len(gone)
+
+
 def send_admin_notification(booking: dict):
     """Send plain text admin notification email"""
     try:
@@ -171,6 +543,33 @@ TIVROX Team
         return False
 
 
+_email_tasks = set()
+
+async def send_booking_emails(booking: dict):
+    """Send both booking emails off the event loop; never raises"""
+    booking_id = booking['id']
+    trace = current_trace.get()
+    try:
+        admin_sent, client_sent = await asyncio.gather(
+            traced("email_admin", asyncio.to_thread(send_admin_notification, booking)),
+            traced("email_client", asyncio.to_thread(send_client_confirmation, booking)),
+        )
+
+        if admin_sent and client_sent:
+            logger.info(f"📧 Both emails sent successfully for booking {booking_id}")
+        elif admin_sent:
+            logger.warning(f"⚠️ Only admin email sent for booking {booking_id}")
+        elif client_sent:
+            logger.warning(f"⚠️ Only client email sent for booking {booking_id}")
+        else:
+            logger.error(f"❌ Both emails failed for booking {booking_id}")
+    except Exception as email_error:
+        logger.error(f"❌ Email sending error for booking {booking_id}: {str(email_error)}")
+    finally:
+        if trace is not None:
+            trace.release()
+
+
 def create_jwt(username: str) -> str:
     payload = {
         "sub": username,
@@ -192,7 +591,422 @@ async def get_current_admin(request: Request):
     if not auth.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing token")
     token = auth.split(" ")[1]
-    return verify_jwt(token)
+    claims = verify_jwt(token)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.admin = True
+    return claims
+
+
+# ─── Recent Bookings Cache ───────────────────────────────
+class RecentBookingsCache:
+    """Write-through cache of the newest bookings for admin list reads.
+
+    Holds every booking created at or after ``window_start`` (or all of them
+    while ``complete``), indexed by service and status. Kept consistent by
+    the write routes in this process, so it assumes a single worker.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.entries = {}
+        self.order = []  # sorted (created_at, id), oldest first
+        self.by_service = defaultdict(set)
+        self.by_status = defaultdict(set)
+        self.window_start = None
+        self.complete = False
+        self.ready = False
+        self.hits = 0
+        self.misses = 0
+        self._warming = False
+        self._pending_updates = {}
+        self._pending_deletes = set()
+
+    def _covers(self, created_at: str) -> bool:
+        return self.complete or (self.window_start is not None and created_at >= self.window_start)
+
+    def _insert(self, booking: dict):
+        doc = {k: v for k, v in booking.items() if k not in ("_id", "ip_address")}
+        self.entries[doc["id"]] = doc
+        bisect.insort(self.order, (doc["created_at"], doc["id"]))
+        self.by_service[doc.get("service")].add(doc["id"])
+        self.by_status[doc.get("status")].add(doc["id"])
+
+    def _discard(self, booking_id: str) -> Optional[dict]:
+        doc = self.entries.pop(booking_id, None)
+        if doc is None:
+            return None
+        key = (doc["created_at"], booking_id)
+        idx = bisect.bisect_left(self.order, key)
+        if idx < len(self.order) and self.order[idx] == key:
+            del self.order[idx]
+        self.by_service[doc.get("service")].discard(booking_id)
+        self.by_status[doc.get("status")].discard(booking_id)
+        return doc
+
+    def _evict(self):
+        while len(self.order) > self.capacity:
+            _, oldest_id = self.order[0]
+            self._discard(oldest_id)
+            self.complete = False
+            # Everything at or after the new oldest entry is still cached
+            self.window_start = self.order[0][0] if self.order else None
+
+    def add(self, booking: dict):
+        if booking["id"] in self.entries:
+            return
+        if self._warming or self._covers(booking["created_at"]):
+            self._insert(booking)
+            self._evict()
+
+    def update(self, booking_id: str, fields: dict):
+        if self._warming:
+            self._pending_updates.setdefault(booking_id, {}).update(fields)
+        doc = self._discard(booking_id)
+        if doc is not None:
+            doc.update(fields)
+            self._insert(doc)
+
+    def remove(self, booking_id: str):
+        if self._warming:
+            self._pending_deletes.add(booking_id)
+        self._discard(booking_id)
+
+    async def warm(self, store):
+        self._warming = True
+        try:
+            docs = await store.list(limit=self.capacity)
+            for doc in docs:
+                if doc["id"] in self._pending_deletes or doc["id"] in self.entries:
+                    continue
+                doc.update(self._pending_updates.get(doc["id"], {}))
+                self._insert(doc)
+            self.complete = len(docs) < self.capacity
+            self.window_start = docs[-1]["created_at"] if docs and not self.complete else None
+            self._evict()
+            self.ready = True
+            logger.info(f"🗂️ Recent bookings cache warmed with {len(self.entries)} bookings")
+        finally:
+            self._warming = False
+            self._pending_updates = {}
+            self._pending_deletes = set()
+
+    def query(self, service: Optional[str], status: Optional[str], limit: int) -> Optional[List[dict]]:
+        """Newest-first filtered bookings, or None if the cache can't answer"""
+        if not self.ready:
+            self.misses += 1
+            return None
+        if service is None and status is None:
+            ids = [booking_id for _, booking_id in reversed(self.order[-limit:])]
+            matched = len(self.order)
+        else:
+            sets = []
+            if service is not None:
+                sets.append(self.by_service.get(service, set()))
+            if status is not None:
+                sets.append(self.by_status.get(status, set()))
+            candidates = set.intersection(*sets) if len(sets) > 1 else sets[0]
+            matched = len(candidates)
+            ids = sorted(candidates, key=lambda i: (self.entries[i]["created_at"], i), reverse=True)[:limit]
+        # Older matches may exist in the DB unless the window already fills the page
+        if not self.complete and matched < limit:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [dict(self.entries[i]) for i in ids]
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "complete": self.complete,
+            "window_start": self.window_start,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+recent_bookings = RecentBookingsCache(RECENT_CACHE_SIZE)
+
+
+# ─── Admission Control ────────────────────────────────────
+class AdmissionGate:
+    """Concurrency limit with a short bounded FIFO queue"""
+
+    def __init__(self, name: str, limit: int, max_queue: Optional[int], timeout: Optional[float]):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiters = deque()
+        self.admitted = 0
+        self.shed = 0
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for w in self.waiters if not w.done())
+
+    def reject(self) -> bool:
+        self.shed += 1
+        return False
+
+    async def acquire(self) -> bool:
+        if self.active < self.limit and not self.queued:
+            self.active += 1
+            self.admitted += 1
+            return True
+        if self.max_queue is not None and self.queued >= self.max_queue:
+            return self.reject()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait({waiter}, timeout=self.timeout)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            waiter.cancel()
+            raise
+        if not waiter.done():
+            # Timed out in the queue; release() skips cancelled waiters
+            waiter.cancel()
+            return self.reject()
+        # release() handed its slot straight to us, so active is unchanged
+        self.admitted += 1
+        return True
+
+    def release(self):
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+admission_gates = {
+    name: AdmissionGate(name, limit, max_queue, timeout)
+    for name, (limit, max_queue, timeout) in ADMISSION_CLASSES.items()
+}
+
+def classify_request(method: str, path: str) -> Optional[str]:
+    if not path.startswith("/api/"):
+        return None
+    if method == "POST" and path == "/api/bookings":
+        return "booking"
+    if method == "GET" and path.startswith("/api/bookings/") and path.endswith("/status"):
+        return "status"
+    if path == "/api/admin/login":
+        return "login"
+    if path == "/api/admin/admission":
+        return None  # must stay reachable under overload
+    if path in ("/api/admin/bookings/export", "/api/admin/bookings/import"):
+        return "bulk"
+    if path.startswith("/api/admin/exports/") and path.endswith("/download"):
+        return "bulk"
+    # Creating an export takes a bulk slot for the job itself (see create_export)
+    if path.startswith("/api/admin/"):
+        return "admin"
+    return None
+
+class AdmissionControlMiddleware:
+    """Pure ASGI so the gate is held until the response body is sent"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        method = scope["method"]
+        route_class = classify_request(method, scope["path"])
+        if route_class is None or method == "OPTIONS":
+            return await self.app(scope, receive, send)
+
+        gate = admission_gates[route_class]
+        booking_gate = admission_gates["booking"]
+        if route_class != "booking" and booking_gate.queued:
+            # Bookings are backing up: shed everything else until they drain
+            admitted = gate.reject()
+        else:
+            with span("admission_wait"):
+                admitted = await gate.acquire()
+            trace = current_trace.get()
+            if trace is not None:
+                trace.admitted = time.perf_counter()
+
+        if not admitted:
+            logger.warning(f"⚠️ Shedding {route_class} request {method} {scope['path']}")
+            retry_after = max(1, math.ceil(gate.timeout or 1))
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is busy. Please try again shortly."},
+                headers={"Retry-After": str(retry_after)}
+            )
+            return await response(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+
+# ─── Tracing ──────────────────────────────────────────────
+# Each request gets a Trace holding named spans. Admin callers see them in
+# a Server-Timing header; the slowest traces per window go to TRACE_LOG_PATH.
+class Trace:
+    __slots__ = ("method", "path", "start", "admitted", "started_at", "spans", "admin", "status", "total_ms", "refs")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.start = time.perf_counter()
+        self.admitted = self.start
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.spans = []
+        self.admin = False
+        self.status = None
+        self.total_ms = None
+        self.refs = 1
+
+    def add(self, name: str, ms: float):
+        self.spans.append((name, ms))
+
+    def mark(self, name: str):
+        """Record a span from admission (request start if ungated) until now"""
+        self.add(name, (time.perf_counter() - self.admitted) * 1000)
+
+    def hold(self):
+        # Background work (e.g. emails) keeps the trace open past the response
+        self.refs += 1
+
+    def release(self):
+        self.refs -= 1
+        if self.refs == 0:
+            trace_recorder.record(self)
+
+    def server_timing(self) -> str:
+        parts = [f"{name};dur={ms:.2f}" for name, ms in self.spans]
+        parts.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.2f}")
+        return ", ".join(parts)
+
+    def to_dict(self) -> dict:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at,
+            "total_ms": round(self.total_ms or 0, 3),
+            "spans": [{"name": n, "ms": round(ms, 3)} for n, ms in self.spans],
+        }
+
+
+class TraceRecorder:
+    """Keeps the slowest N traces per window and appends them to the trace log"""
+
+    def __init__(self, path: Path, keep: int, window: int):
+        self.path = path
+        self.keep = keep
+        self.window = window
+        self.window_start = time.time()
+        self.heap = []
+        self.last_flushed = []
+        self._seq = 0
+
+    def record(self, trace: Trace):
+        if self.keep <= 0:
+            return
+        if time.time() - self.window_start >= self.window:
+            self.flush()
+        self._seq += 1
+        entry = (trace.total_ms or 0, self._seq, trace)
+        if len(self.heap) < self.keep:
+            heapq.heappush(self.heap, entry)
+        elif entry[0] > self.heap[0][0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def slowest(self) -> List[dict]:
+        return [t.to_dict() for _, _, t in sorted(self.heap, key=lambda e: e[0], reverse=True)]
+
+    def flush(self):
+        self.window_start = time.time()
+        if not self.heap:
+            return
+        traces = self.slowest()
+        self.heap = []
+        self.last_flushed = traces
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for t in traces:
+                    f.write(json.dumps(t) + "\n")
+        except Exception as e:
+            logger.error(f"❌ Failed to write trace log: {str(e)}")
+
+
+current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("current_trace", default=None)
+trace_recorder = TraceRecorder(TRACE_LOG_PATH, TRACE_SLOWEST_N, TRACE_LOG_WINDOW)
+
+@contextlib.contextmanager
+def span(name: str):
+    trace = current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, (time.perf_counter() - start) * 1000)
+
+async def traced(name: str, awaitable):
+    with span(name):
+        return await awaitable
+
+def _has_admin_token(headers: Headers) -> bool:
+    auth = headers.get("authorization", "")
+    if not auth.startswith("Bearer "):
+        return False
+    try:
+        verify_jwt(auth.split(" ")[1])
+        return True
+    except HTTPException:
+        return False
+
+class TracingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        trace = Trace(scope["method"], scope["path"])
+        token = current_trace.set(trace)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+                if trace.admin or _has_admin_token(Headers(scope=scope)):
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", trace.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            trace.total_ms = (time.perf_counter() - trace.start) * 1000
+            current_trace.reset(token)
+            trace.release()
 
 
 # ─── Routes ───────────────────────────────────────────────
@@ -208,13 +1022,19 @@ async def health():
 # ─── Booking Submission ───────────────────────────────────
 @api_router.post("/bookings")
 async def create_booking(data: BookingCreate, request: Request):
+    trace = current_trace.get()
+    if trace is not None:
+        # Body parsing and Pydantic validation run after admission, before the handler
+        trace.mark("validation")
     booking_id = str(uuid.uuid4())
     ip = get_client_ip(request)
     logger.info(f"Booking request received from IP: {ip} | ID: {booking_id}")
     
     try:
         # Rate limit check - legitimate spam protection
-        if not check_rate_limit(ip):
+        with span("rate_limit"):
+            allowed = check_rate_limit(ip)
+        if not allowed:
             logger.warning(f"Rate limit exceeded for IP: {ip}")
             raise HTTPException(status_code=429, detail="Too many requests. Please try again later.")
 
@@ -224,39 +1044,43 @@ async def create_booking(data: BookingCreate, request: Request):
             logger.warning(f"Honeypot triggered from IP: {ip}")
             raise HTTPException(status_code=400, detail="Invalid submission")
 
+        # Early spam rejection - runs before any sanitization or DB work
+        with span("spam_check"):
+            spam_reason = early_spam_check(data, ip)
+        if spam_reason:
+            # No reputation penalty here: the IP comes from X-Forwarded-For,
+            # which the client controls. Admin spam deletes penalize instead.
+            spam_stats[spam_reason] += 1
+            logger.warning(f"Spam rejected ({spam_reason}) from IP: {ip}")
+            raise HTTPException(status_code=400, detail="Invalid submission")
+
         # Sanitize inputs
-        booking = {
-            "id": booking_id,
-            "full_name": sanitize(data.full_name),
-            "email": sanitize(data.email),
-            "phone": sanitize(data.phone),
-            "service": sanitize(data.service),
-            "project_deadline": sanitize(data.project_deadline) if data.project_deadline else None,
-            "project_description": sanitize(data.project_description),
-            "website_type": sanitize(data.website_type) if data.website_type else None,
-            "platform": sanitize(data.platform) if data.platform else None,
-            "video_type": sanitize(data.video_type) if data.video_type else None,
-            "design_type": sanitize(data.design_type) if data.design_type else None,
-            "status": "New",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "ip_address": ip
-        }
+        with span("sanitize"):
+            booking = build_booking(data, booking_id, ip)
 
         # Log validation issues but DON'T block submission
-        if not booking["full_name"] or not booking["email"] or not booking["phone"] or not booking["project_description"]:
+        if missing_required_fields(booking):
             logger.warning(f"⚠️ Booking {booking_id} has missing required fields - saving anyway")
         
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_regex, booking["email"]):
+        if not EMAIL_RE.match(booking["email"]):
             logger.warning(f"⚠️ Booking {booking_id} has invalid email format - saving anyway")
 
-        # Save to MongoDB with retry logic - NEVER FAIL
+        # Save to the database with retry logic - NEVER FAIL
         db_saved = False
         for attempt in range(3):
             try:
-                await db.bookings.insert_one(booking)
+                with span(f"db_insert_{attempt + 1}"):
+                    # A timed-out attempt may still have written the booking;
+                    # inserting again would only hit the unique id index
+                    if attempt and await storage.bookings.get(booking_id, ("id",)):
+                        logger.warning(f"⚠️ Booking {booking_id} was saved by an earlier attempt despite the error")
+                    else:
+                        await storage.bookings.insert(booking)
                 logger.info(f"✅ Booking {booking_id} saved to database successfully (attempt {attempt + 1})")
                 db_saved = True
+                record_description(data.project_description or "", data.email)
+                recent_bookings.add(booking)
+                invalidate_booking_status(booking_id)
                 break
             except Exception as db_error:
                 logger.error(f"❌ Database save attempt {attempt + 1} failed for booking {booking_id}: {str(db_error)}")
@@ -269,21 +1093,12 @@ async def create_booking(data: BookingCreate, request: Request):
         if db_saved:
             logger.info(f"📋 New booking: {booking['full_name']} | {booking['email']} | {booking['service']}")
             
-            # Send email notifications (don't fail if emails fail)
-            try:
-                admin_sent = send_admin_notification(booking)
-                client_sent = send_client_confirmation(booking)
-                
-                if admin_sent and client_sent:
-                    logger.info(f"📧 Both emails sent successfully for booking {booking_id}")
-                elif admin_sent:
-                    logger.warning(f"⚠️ Only admin email sent for booking {booking_id}")
-                elif client_sent:
-                    logger.warning(f"⚠️ Only client email sent for booking {booking_id}")
-                else:
-                    logger.error(f"❌ Both emails failed for booking {booking_id}")
-            except Exception as email_error:
-                logger.error(f"❌ Email sending error for booking {booking_id}: {str(email_error)}")
+            # Send email notifications after responding (don't fail if emails fail)
+            if trace is not None:
+                trace.hold()
+            task = asyncio.create_task(send_booking_emails(booking))
+            _email_tasks.add(task)
+            task.add_done_callback(_email_tasks.discard)
         else:
             logger.critical(f"🚨 FAILED BOOKING: {booking['full_name']} | {booking['email']} | {booking['service']}")
 
@@ -310,6 +1125,66 @@ async def create_booking(data: BookingCreate, request: Request):
         }
 
 
+# ─── Booking Status Lookup ───────────────────────────────
+status_cache = TTLCache(STATUS_CACHE_SIZE, STATUS_CACHE_TTL)
+_STATUS_FIELDS = ("status", "created_at", "updated_at")
+_status_lookups = {}
+
+def _finish_status_lookup(booking_id: str, lookup: asyncio.Future):
+    # A write during the read invalidated it; don't cache stale data
+    if _status_lookups.get(booking_id) is not lookup:
+        return
+    del _status_lookups[booking_id]
+    # Failed reads are not cached, so the next poll tries the DB again
+    if not lookup.cancelled() and lookup.exception() is None:
+        status_cache.set(booking_id, lookup.result())
+
+def invalidate_booking_status(booking_id: str):
+    status_cache.invalidate(booking_id)
+    _status_lookups.pop(booking_id, None)
+
+@api_router.get("/bookings/{booking_id}/status")
+async def get_booking_status(booking_id: str, request: Request):
+    """Status and timestamps only, for clients polling with their booking ID"""
+    ip = get_client_ip(request)
+    if not check_rate_limit(ip, status_rate_limit_store, STATUS_RATE_LIMIT_MAX):
+        raise HTTPException(status_code=429, detail="Too many requests. Please try again later.")
+    if len(booking_id) > 64:
+        raise HTTPException(status_code=404, detail="Booking not found")
+
+    # Unknown IDs are cached too, so polling a bad ID doesn't reach the DB
+    with span("cache"):
+        result = status_cache.get(booking_id, ...)
+    if result is ...:
+        cached = recent_bookings.entries.get(booking_id)
+        if cached is not None:
+            result = {f: cached.get(f) for f in _STATUS_FIELDS}
+            status_cache.set(booking_id, result)
+        elif recent_bookings.ready and recent_bookings.complete:
+            result = None  # the cache holds every booking
+            status_cache.set(booking_id, result)
+        else:
+            # Concurrent pollers of the same ID share one DB read
+            lookup = _status_lookups.get(booking_id)
+            if lookup is None:
+                lookup = asyncio.ensure_future(storage.bookings.get(booking_id, _STATUS_FIELDS))
+                _status_lookups[booking_id] = lookup
+                lookup.add_done_callback(lambda done: _finish_status_lookup(booking_id, done))
+            try:
+                result = await traced("db_find_status", asyncio.shield(lookup))
+            except Exception as e:
+                logger.error(f"❌ Status lookup failed for booking {booking_id}: {str(e)}")
+                raise HTTPException(
+                    status_code=503,
+                    detail="Status is temporarily unavailable. Please try again shortly.",
+                    headers={"Retry-After": "1"}
+                )
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    return {"booking_id": booking_id, **{f: result.get(f) for f in _STATUS_FIELDS}}
+
+
 # ─── Admin Auth ───────────────────────────────────────────
 @api_router.post("/admin/login")
 async def admin_login(data: AdminLogin, request: Request):
@@ -317,17 +1192,57 @@ async def admin_login(data: AdminLogin, request: Request):
     if not check_rate_limit(ip):
         raise HTTPException(status_code=429, detail="Too many login attempts")
 
-    admin = await db.admins.find_one({"username": data.username}, {"_id": 0})
+    # A login right after a cold start may race the deferred seed
+    seed_task = startup_tasks.get("seed_admin")
+    if seed_task is not None and not seed_task.done():
+        await asyncio.shield(seed_task)
+
+    admin = await traced("db_find_admin", storage.admins.find_by_username(data.username))
     if not admin:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    if not bcrypt.checkpw(data.password.encode('utf-8'), admin['password_hash'].encode('utf-8')):
+    with span("bcrypt"):
+        # bcrypt is deliberately slow; keep it off the event loop
+        password_ok = await asyncio.to_thread(
+            bcrypt.checkpw, data.password.encode('utf-8'), admin['password_hash'].encode('utf-8')
+        )
+    if not password_ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     token = create_jwt(data.username)
     return {"token": token, "username": admin["username"]}
 
 
+# ─── Admin: Queries ──────────────────────────────────────
+async def list_bookings(service: Optional[str], status: Optional[str], limit: int) -> List[dict]:
+    """Newest-first bookings, from the recent cache when it can answer"""
+    with span("cache"):
+        bookings = recent_bookings.query(service or None, status or None, limit)
+    if bookings is not None:
+        return bookings
+    return await traced("db_find", storage.bookings.list(service, status, limit))
+
+async def compute_stats() -> dict:
+    # Independent queries: run them together so the cost is the slowest one
+    total, new_count, contacted, in_progress, completed, services = await asyncio.gather(
+        traced("db_count_total", storage.bookings.count()),
+        traced("db_count_new", storage.bookings.count(status="New")),
+        traced("db_count_contacted", storage.bookings.count(status="Contacted")),
+        traced("db_count_in_progress", storage.bookings.count(status="In Progress")),
+        traced("db_count_completed", storage.bookings.count(status="Completed")),
+        traced("db_count_by_service", storage.bookings.count_by_service()),
+    )
+
+    return {
+        "total": total,
+        "new": new_count,
+        "contacted": contacted,
+        "in_progress": in_progress,
+        "completed": completed,
+        "by_service": services
+    }
+
+
 # ─── Admin: Get Bookings ─────────────────────────────────
 @api_router.get("/admin/bookings")
 async def get_bookings(
@@ -335,13 +1250,7 @@ async def get_bookings(
     status: Optional[str] = None,
     admin: dict = Depends(get_current_admin)
 ):
-    query = {}
-    if service:
-        query["service"] = service
-    if status:
-        query["status"] = status
-
-    bookings = await db.bookings.find(query, {"_id": 0, "ip_address": 0}).sort("created_at", -1).to_list(1000)
+    bookings = await list_bookings(service, status, ADMIN_LIST_LIMIT)
     return {"bookings": bookings, "total": len(bookings)}
 
 
@@ -352,16 +1261,15 @@ async def update_booking_status(
     data: StatusUpdate,
     admin: dict = Depends(get_current_admin)
 ):
-    valid_statuses = ["New", "Contacted", "In Progress", "Completed"]
-    if data.status not in valid_statuses:
-        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
+    if data.status not in VALID_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {VALID_STATUSES}")
 
-    result = await db.bookings.update_one(
-        {"id": booking_id},
-        {"$set": {"status": data.status, "updated_at": datetime.now(timezone.utc).isoformat()}}
-    )
-    if result.matched_count == 0:
+    fields = {"status": data.status, "updated_at": datetime.now(timezone.utc).isoformat()}
+    matched = await traced("db_update", storage.bookings.update(booking_id, fields))
+    if not matched:
         raise HTTPException(status_code=404, detail="Booking not found")
+    recent_bookings.update(booking_id, fields)
+    invalidate_booking_status(booking_id)
 
     return {"status": "success", "message": f"Status updated to {data.status}"}
 
@@ -369,22 +1277,273 @@ async def update_booking_status(
 # ─── Admin: Delete Booking ───────────────────────────────
 @api_router.delete("/admin/bookings/{booking_id}")
 async def delete_booking(booking_id: str, admin: dict = Depends(get_current_admin)):
-    result = await db.bookings.delete_one({"id": booking_id})
-    if result.deleted_count == 0:
+    deleted = await traced("db_delete", storage.bookings.delete(booking_id))
+    recent_bookings.remove(booking_id)
+    invalidate_booking_status(booking_id)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Booking not found")
     return {"status": "success", "message": "Booking deleted"}
 
 
+# ─── Admin: Bulk Delete ──────────────────────────────────
+@api_router.post("/admin/bookings/bulk-delete")
+async def bulk_delete_bookings(data: BulkDelete, admin: dict = Depends(get_current_admin)):
+    if not data.ids:
+        return {"status": "success", "deleted": 0, "blocklisted": 0}
+
+    blocklisted = 0
+    if data.spam:
+        # Spam decisions feed the early-rejection filter
+        spam = await traced("db_find", storage.bookings.get_many(data.ids, ("email", "ip_address")))
+        keys = []
+        for booking in spam:
+            if booking.get("email"):
+                keys.append(f"email:{booking['email'].strip().lower()}")
+            if booking.get("ip_address"):
+                # Client-supplied, so it only expires out of the reputation map
+                penalize_ip(booking["ip_address"], SPAM_SCORE_THRESHOLD)
+        blocklisted = await add_to_blocklist(keys)
+
+    deleted = await traced("db_delete_many", storage.bookings.delete_many(data.ids))
+    for booking_id in data.ids:
+        recent_bookings.remove(booking_id)
+        invalidate_booking_status(booking_id)
+    logger.info(f"🗑️ Bulk deleted {deleted} bookings (spam={data.spam})")
+    return {"status": "success", "deleted": deleted, "blocklisted": blocklisted}
+
+
+# ─── Admin: Spam Filter ──────────────────────────────────
+def _spam_filter_view() -> dict:
+    bloom = get_spam_filter()
+    return {
+        "entries": len(spam_blocklist),
+        "size_bits": bloom.size,
+        "hashes": bloom.hashes,
+        "tracked_ips": len(ip_reputation),
+        "rejected": dict(spam_stats),
+    }
+
+def _blocklist_update_keys(data: BlocklistUpdate) -> List[str]:
+    keys = [f"email:{e.strip().lower()}" for e in data.emails if e.strip()]
+    keys += [f"domain:{d.strip().lower()}" for d in data.domains if d.strip()]
+    return keys
+
+def _blocklist_update_ips(data: BlocklistUpdate) -> List[str]:
+    return [i.strip() for i in data.ips if i.strip()]
+
+@api_router.get("/admin/spam")
+async def get_spam_filter_stats(admin: dict = Depends(get_current_admin)):
+    return _spam_filter_view()
+
+@api_router.post("/admin/spam/blocklist")
+async def update_blocklist(data: BlocklistUpdate, admin: dict = Depends(get_current_admin)):
+    added = await add_to_blocklist(_blocklist_update_keys(data))
+    # IPs are shared and spoofable, so they get a reputation score that expires
+    for ip in _blocklist_update_ips(data):
+        penalize_ip(ip, SPAM_SCORE_THRESHOLD)
+    return {"status": "success", "added": added, **_spam_filter_view()}
+
+@api_router.post("/admin/spam/blocklist/remove")
+async def remove_blocklist_entries(data: BlocklistUpdate, admin: dict = Depends(get_current_admin)):
+    removed = await remove_from_blocklist(_blocklist_update_keys(data))
+    for ip in _blocklist_update_ips(data):
+        ip_reputation.pop(ip, None)
+    return {"status": "success", "removed": removed, **_spam_filter_view()}
+
+@api_router.post("/admin/spam/reload")
+async def reload_spam_filter(admin: dict = Depends(get_current_admin)):
+    # Picks up edits made to the blocklist file by hand
+    async with _blocklist_lock:
+        await asyncio.to_thread(load_spam_filter)
+    return {"status": "success", **_spam_filter_view()}
+
+
+# ─── Admin: Bulk Import ──────────────────────────────────
+class ImportRowError(ValueError):
+    pass
+
+async def iter_import_records(request: Request, fmt: str):
+    """Yield (row_number, dict) from a streamed CSV or NDJSON body.
+
+    Only the current record is buffered. A CSV record may span physical
+    lines inside quotes; it is complete once its quote count is even.
+    """
+    import csv
+
+    header = None
+    pending = ""
+    row_number = 0
+    buffer = ""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+
+    def parse(record: str):
+        nonlocal header
+        if fmt == "ndjson":
+            try:
+                row = json.loads(record)
+            except ValueError as e:
+                raise ImportRowError(f"Invalid JSON: {e}")
+            if not isinstance(row, dict):
+                raise ImportRowError("Expected a JSON object")
+            return row
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [h.strip() for h in values]
+            return None
+        return dict(zip(header, values))
+
+    async def chunks():
+        async for chunk in request.stream():
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True) + "\n"
+
+    async for text in chunks():
+        buffer += text
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            pending = f"{pending}\n{line}" if pending else line
+            if fmt == "csv" and pending.count('"') % 2:
+                if len(pending) > IMPORT_MAX_RECORD_BYTES:
+                    raise HTTPException(status_code=400, detail="Unterminated quoted field in CSV")
+                continue
+            record, pending = pending.rstrip("\r"), ""
+            if not record.strip():
+                continue
+            if header is not None or fmt == "ndjson":
+                row_number += 1
+            if len(record) > IMPORT_MAX_RECORD_BYTES:
+                yield row_number, ImportRowError("Record too large")
+                continue
+            try:
+                row = parse(record)
+            except ImportRowError as e:
+                yield row_number, e
+                continue
+            if row is not None:
+                yield row_number, row
+        if len(buffer) > IMPORT_MAX_RECORD_BYTES:
+            raise HTTPException(status_code=400, detail="Line too long")
+
+def import_row_to_booking(row: dict) -> dict:
+    """Validate and sanitize an imported row the same way create_booking does"""
+    fields = {k: (str(v) if v not in ("", None) else None) for k, v in row.items() if k in BookingCreate.model_fields}
+    try:
+        data = BookingCreate(**fields)
+    except ValidationError as e:
+        raise ImportRowError("; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+
+    booking = build_booking(data, sanitize(str(row.get("id") or "")), None)
+    missing = missing_required_fields(booking)
+    if not row.get("created_at"):
+        # Stamping "now" would make every re-import of the row look new
+        missing.append("created_at")
+    if missing:
+        raise ImportRowError(f"Missing required fields: {', '.join(missing)}")
+
+    if row.get("status") in VALID_STATUSES:
+        booking["status"] = row["status"]
+    for ts_field in ("created_at", "updated_at"):
+        value = row.get(ts_field)
+        if not value:
+            continue
+        try:
+            booking[ts_field] = to_utc_isoformat(value)
+        except ValueError:
+            raise ImportRowError(f"{ts_field}: not an ISO timestamp")
+    if not booking["id"]:
+        content = json.dumps([booking[f] for f in ("email", "created_at", "full_name", "phone", "service", "project_description")])
+        booking["id"] = str(uuid.uuid5(IMPORT_ID_NAMESPACE, content))
+    booking["source"] = "import"
+    return booking
+
+async def insert_import_batch(batch: List[dict], summary: dict):
+    # Drop duplicates within the batch, then those already in the DB
+    seen_ids, seen_keys, unique = set(), set(), []
+    for booking in batch:
+        key = (booking["email"], booking["created_at"])
+        if booking["id"] in seen_ids or key in seen_keys:
+            summary["skipped"] += 1
+            continue
+        seen_ids.add(booking["id"])
+        seen_keys.add(key)
+        unique.append(booking)
+
+    existing = await traced("db_find_duplicates", storage.bookings.find_existing(
+        [b["id"] for b in unique], [(b["email"], b["created_at"]) for b in unique]
+    ))
+    existing_ids = {e["id"] for e in existing}
+    existing_keys = {(e.get("email"), e.get("created_at")) for e in existing}
+    fresh = [b for b in unique if b["id"] not in existing_ids and (b["email"], b["created_at"]) not in existing_keys]
+    summary["skipped"] += len(unique) - len(fresh)
+    if not fresh:
+        return
+
+    inserted = await traced("db_insert_many", storage.bookings.insert_many(fresh))
+    summary["skipped"] += len(fresh) - len(inserted)
+    summary["inserted"] += len(inserted)
+    for booking in inserted:
+        recent_bookings.add(booking)
+        invalidate_booking_status(booking["id"])
+
+@api_router.post("/admin/bookings/import")
+async def import_bookings(request: Request, format: Optional[str] = None, admin: dict = Depends(get_current_admin)):
+    """Stream CSV or NDJSON leads into the DB. Never sends emails."""
+    content_type = request.headers.get("content-type", "")
+    fmt = (format or ("ndjson" if "json" in content_type else "csv")).lower()
+    if fmt not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+
+    summary = {"inserted": 0, "skipped": 0, "rejected": 0, "errors": []}
+    batch = []
+    row_number = 0
+    try:
+        async for row_number, row in iter_import_records(request, fmt):
+            try:
+                if isinstance(row, ImportRowError):
+                    raise row
+                with span("sanitize"):
+                    batch.append(import_row_to_booking(row))
+            except ImportRowError as e:
+                summary["rejected"] += 1
+                if len(summary["errors"]) < IMPORT_MAX_ERRORS:
+                    summary["errors"].append({"row": row_number, "error": str(e)})
+                continue
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await insert_import_batch(batch, summary)
+                batch = []
+    except HTTPException as e:
+        # Earlier batches are already committed, so report them alongside the
+        # error; everything before the bad record is imported, nothing after
+        if batch:
+            await insert_import_batch(batch, summary)
+        logger.warning(f"⚠️ Import aborted after row {row_number}: {e.detail} ({summary['inserted']} inserted)")
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"status": "aborted", "detail": e.detail, "aborted_after_row": row_number, **summary}
+        )
+    if batch:
+        await insert_import_batch(batch, summary)
+
+    logger.info(f"📥 Import finished: {summary['inserted']} inserted, {summary['skipped']} skipped, {summary['rejected']} rejected")
+    return {"status": "success", **summary}
+
+
 # ─── Admin: Export CSV ────────────────────────────────────
-@api_router.get("/admin/bookings/export")
-async def export_bookings(admin: dict = Depends(get_current_admin)):
-    bookings = await db.bookings.find({}, {"_id": 0, "ip_address": 0}).sort("created_at", -1).to_list(10000)
+def _bookings_csv(bookings: List[dict]) -> io.StringIO:
+    import csv
 
     output = io.StringIO()
     if bookings:
-        writer = csv.DictWriter(output, fieldnames=bookings[0].keys())
+        # Documents differ (updated_at, imported rows), so use the fixed column set
+        writer = csv.DictWriter(output, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
         writer.writeheader()
         writer.writerows(bookings)
+    return output
+
+@api_router.get("/admin/bookings/export")
+async def export_bookings(admin: dict = Depends(get_current_admin)):
+    bookings = await traced("db_find", storage.bookings.list(limit=10000))
+    output = await traced("csv_build", asyncio.to_thread(_bookings_csv, bookings))
 
     output.seek(0)
     return StreamingResponse(
@@ -394,33 +1553,225 @@ async def export_bookings(admin: dict = Depends(get_current_admin)):
     )
 
 
+# ─── Admin: Export Jobs ──────────────────────────────────
+def _export_job_view(job: dict) -> dict:
+    return {k: v for k, v in job.items() if k not in ("path", "task")}
+
+def _prune_export_jobs():
+    finished = [j for j in export_jobs.values() if j["status"] in ("completed", "failed")]
+    finished.sort(key=lambda j: j["created_at"])
+    for job in finished[:max(0, len(finished) - EXPORT_RETENTION)]:
+        export_jobs.pop(job["id"], None)
+        Path(job["path"]).unlink(missing_ok=True)
+
+async def run_export_job(job: dict):
+    import csv
+
+    job["status"] = "running"
+    tmp_path = Path(job["path"]).with_suffix(".part")
+    try:
+        job["total"] = await storage.bookings.count_changed_since(job["since"])
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            cursor = job["since"]
+            async for booking in storage.bookings.iter_changed_since(job["since"]):
+                writer.writerow(booking)
+                job["processed"] += 1
+                cursor = max(cursor or "", booking.get("modified_at") or "") or None
+        os.replace(tmp_path, job["path"])
+        # The next export continues after the newest write actually exported,
+        # so writes that land while this one runs are never skipped
+        job["cursor"] = cursor
+        job["size"] = Path(job["path"]).stat().st_size
+        job["status"] = "completed"
+        logger.info(f"📦 Export {job['id']} completed: {job['processed']} bookings")
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        job["status"] = "failed"
+        job["error"] = str(e)
+        logger.error(f"❌ Export {job['id']} failed: {str(e)}")
+    finally:
+        job["finished_at"] = datetime.now(timezone.utc).isoformat()
+        job.pop("task", None)
+        _prune_export_jobs()
+
+def _parse_range(header: str, size: int):
+    """Parse a single ``bytes=start-end`` range; returns (start, end) or None"""
+    units, _, spec = header.partition("=")
+    if units.strip() != "bytes" or "," in spec:
+        return None
+    start, _, end = spec.strip().partition("-")
+    try:
+        if start:
+            start, end = int(start), int(end) if end else size - 1
+        else:
+            start, end = size - int(end), size - 1
+    except ValueError:
+        return None
+    start, end = max(start, 0), min(end, size - 1)
+    if start > end:
+        return None
+    return start, end
+
+def _iter_file(path: Path, start: int, length: int, chunk_size: int = 64 * 1024):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+@api_router.post("/admin/exports")
+async def create_export(data: Optional[ExportCreate] = None, admin: dict = Depends(get_current_admin)):
+    since = data.since if data else None
+    if since:
+        # Cursors are compared as strings, so they must match the stored format
+        try:
+            since = to_utc_isoformat(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="since must be an ISO 8601 timestamp")
+    # The job outlives this request, so it holds the bulk slot until it finishes
+    gate = admission_gates["bulk"]
+    if not await gate.acquire():
+        logger.warning("⚠️ Shedding export job: bulk work is at capacity")
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy. Please try again shortly.",
+            headers={"Retry-After": str(max(1, math.ceil(gate.timeout or 1)))}
+        )
+    job_id = str(uuid.uuid4())
+    try:
+        EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        gate.release()
+        raise
+    now = datetime.now(timezone.utc).isoformat()
+    job = {
+        "id": job_id,
+        "status": "queued",
+        "since": since,
+        "cursor": None,  # set on completion; pass it as since= for the next export
+        "processed": 0,
+        "total": None,
+        "size": None,
+        "error": None,
+        "created_at": now,
+        "finished_at": None,
+        "path": str(EXPORT_DIR / f"{job_id}.csv"),
+    }
+    export_jobs[job_id] = job
+    job["task"] = asyncio.create_task(run_export_job(job))
+    # A done callback also fires if the task is cancelled before it starts
+    job["task"].add_done_callback(lambda _: gate.release())
+    logger.info(f"📦 Export {job_id} started (since={since})")
+    return _export_job_view(job)
+
+@api_router.get("/admin/exports/{job_id}")
+async def get_export(job_id: str, admin: dict = Depends(get_current_admin)):
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return _export_job_view(job)
+
+@api_router.get("/admin/exports/{job_id}/download")
+async def download_export(job_id: str, request: Request, admin: dict = Depends(get_current_admin)):
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Export is {job['status']}")
+
+    path = Path(job["path"])
+    size = path.stat().st_size
+    filename = f"tivrox_bookings_{job['created_at'][:10].replace('-', '')}_{job_id[:8]}.csv"
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Accept-Ranges": "bytes",
+    }
+
+    range_header = request.headers.get("range")
+    if not range_header:
+        return FileResponse(path, media_type="text/csv", headers=headers)
+
+    byte_range = _parse_range(range_header, size)
+    if byte_range is None:
+        raise HTTPException(status_code=416, detail="Invalid range", headers={"Content-Range": f"bytes */{size}"})
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _iter_file(path, start, end - start + 1),
+        status_code=206,
+        media_type="text/csv",
+        headers=headers
+    )
+
+
 # ─── Admin: Stats ────────────────────────────────────────
 @api_router.get("/admin/stats")
 async def get_stats(admin: dict = Depends(get_current_admin)):
-    total = await db.bookings.count_documents({})
-    new_count = await db.bookings.count_documents({"status": "New"})
-    contacted = await db.bookings.count_documents({"status": "Contacted"})
-    in_progress = await db.bookings.count_documents({"status": "In Progress"})
-    completed = await db.bookings.count_documents({"status": "Completed"})
+    return await compute_stats()
 
-    # Service breakdown
-    pipeline = [{"$group": {"_id": "$service", "count": {"$sum": 1}}}]
-    service_stats = await db.bookings.aggregate(pipeline).to_list(100)
-    services = {s["_id"]: s["count"] for s in service_stats if s["_id"]}
 
+# ─── Admin: Dashboard ────────────────────────────────────
+@api_router.get("/admin/dashboard")
+async def get_dashboard(
+    service: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = ADMIN_LIST_LIMIT,
+    admin: dict = Depends(get_current_admin)
+):
+    """Stats, first page of bookings and filter facets in one round-trip"""
+    limit = max(1, min(limit, ADMIN_LIST_LIMIT))
+    stats, bookings = await asyncio.gather(compute_stats(), list_bookings(service, status, limit))
+    status_counts = {
+        "New": stats["new"],
+        "Contacted": stats["contacted"],
+        "In Progress": stats["in_progress"],
+        "Completed": stats["completed"],
+    }
     return {
-        "total": total,
-        "new": new_count,
-        "contacted": contacted,
-        "in_progress": in_progress,
-        "completed": completed,
-        "by_service": services
+        "stats": stats,
+        "bookings": bookings,
+        "total": len(bookings),
+        "facets": {
+            "services": [{"value": k, "count": v} for k, v in sorted(stats["by_service"].items())],
+            "statuses": [{"value": k, "count": status_counts[k]} for k in VALID_STATUSES],
+        },
+    }
+
+
+# ─── Admin: Admission ────────────────────────────────────
+@api_router.get("/admin/admission")
+async def get_admission_stats(admin: dict = Depends(get_current_admin)):
+    return {name: gate.stats() for name, gate in admission_gates.items()}
+
+
+# ─── Admin: Cache ────────────────────────────────────────
+@api_router.get("/admin/cache")
+async def get_cache_stats(admin: dict = Depends(get_current_admin)):
+    return recent_bookings.stats()
+
+
+# ─── Admin: Traces ───────────────────────────────────────
+@api_router.get("/admin/traces")
+async def get_traces(admin: dict = Depends(get_current_admin)):
+    return {
+        "window_seconds": trace_recorder.window,
+        "current": trace_recorder.slowest(),
+        "last_flushed": trace_recorder.last_flushed,
     }
 
 
 # ─── App Config ───────────────────────────────────────────
 app.include_router(api_router)
 
+# Last added runs first: CORS, then tracing, then admission control
+app.add_middleware(AdmissionControlMiddleware)
+app.add_middleware(TracingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -430,23 +1781,244 @@ app.add_middleware(
 )
 
 
+# ─── Frontend ─────────────────────────────────────────────
+# With FRONTEND_BUILD_DIR set, the React build is served from the API origin,
+# which removes the cross-origin CORS preflight from every booking submit.
+# Hashed assets under static/ use .br/.gz files written by the frontend's
+# postbuild step; the HTML shell is revalidated with an ETag.
+def parse_accept_encoding(header: str) -> dict:
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    weights = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding.lower()] = q
+    return weights
+
+class FrontendBuild:
+    ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+    def __init__(self, build_dir: Path):
+        self.root = build_dir.resolve()
+        self._shell = None  # (mtime, body, etag)
+
+    def resolve(self, path: str) -> Optional[Path]:
+        candidate = (self.root / path).resolve()
+        if candidate != self.root and self.root not in candidate.parents:
+            return None
+        return candidate if candidate.is_file() else None
+
+    def shell(self):
+        index = self.root / "index.html"
+        mtime = index.stat().st_mtime_ns
+        if self._shell is None or self._shell[0] != mtime:
+            body = index.read_bytes()
+            etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+            self._shell = (mtime, body, etag)
+        return self._shell
+
+    def serve_file(self, file: Path, request: Request, cache_control: str) -> Response:
+        weights = parse_accept_encoding(request.headers.get("accept-encoding", ""))
+        headers = {"Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        media_type = mimetypes.guess_type(file.name)[0] or "application/octet-stream"
+        # Highest q-value first; ties keep our preference order (br, then gzip)
+        candidates = [(weights.get(encoding, weights.get("*", 0.0)), -i, encoding, suffix)
+                      for i, (encoding, suffix) in enumerate(self.ENCODINGS)]
+        for q, _, encoding, suffix in sorted(candidates, reverse=True):
+            if q > 0:
+                compressed = file.with_name(file.name + suffix)
+                if compressed.is_file():
+                    headers["Content-Encoding"] = encoding
+                    return FileResponse(compressed, media_type=media_type, headers=headers)
+        return FileResponse(file, media_type=media_type, headers=headers)
+
+    def serve_shell(self, request: Request) -> Response:
+        _, body, etag = self.shell()
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="text/html", headers=headers)
+
+
+if FRONTEND_BUILD_DIR:
+    frontend_build = FrontendBuild(Path(FRONTEND_BUILD_DIR))
+
+    @app.api_route("/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+    async def serve_frontend(path: str, request: Request):
+        if path == "api" or path.startswith("api/"):
+            raise HTTPException(status_code=404, detail="Not Found")
+        if path and path != "index.html":
+            file = frontend_build.resolve(path)
+            if file is not None:
+                cache = IMMUTABLE_CACHE if path.startswith("static/") else STATIC_CACHE
+                return frontend_build.serve_file(file, request, cache)
+            if path.startswith("static/"):
+                raise HTTPException(status_code=404, detail="Not Found")
+        # Client-side routes (/admin/login, ...) all get the app shell
+        return frontend_build.serve_shell(request)
+
+
 # ─── Startup: Seed Admin ─────────────────────────────────
-@app.on_event("startup")
+# Deferred startup work, by name, so requests can wait on what they need
+startup_tasks = {}
+startup_timings = {}  # name -> ms the task itself ran, for --profile-startup
+
 async def seed_admin():
-    existing = await db.admins.find_one({"username": os.environ.get('ADMIN_USERNAME')})
-    if not existing:
-        password = os.environ.get('ADMIN_PASSWORD', '1234')
-        hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        await db.admins.insert_one({
-            "id": str(uuid.uuid4()),
-            "username": os.environ.get('ADMIN_USERNAME'),
-            "password_hash": hashed,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        })
-        logger.info("Admin user seeded successfully")
-    else:
-        logger.info("Admin user already exists")
+    try:
+        existing = await storage.admins.find_by_username(os.environ.get('ADMIN_USERNAME'))
+        if not existing:
+            password = os.environ.get('ADMIN_PASSWORD', '1234')
+            # bcrypt is deliberately slow; keep it off the event loop
+            hashed = await asyncio.to_thread(
+                lambda: bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+            )
+            await storage.admins.insert({
+                "id": str(uuid.uuid4()),
+                "username": os.environ.get('ADMIN_USERNAME'),
+                "password_hash": hashed,
+                "created_at": datetime.now(timezone.utc).isoformat()
+            })
+            logger.info("Admin user seeded successfully")
+        else:
+            logger.info("Admin user already exists")
+    except Exception as e:
+        logger.error(f"❌ Failed to seed admin user: {str(e)}")
+
+async def warm_sanitizer():
+    # Its own task, so a slow DB at cold start can't delay it and leave the
+    # first booking paying for the html5lib import on the event loop
+    await asyncio.to_thread(bleach._load)
+
+async def ensure_indexes():
+    # Delta exports filter on these; without indexes they scan everything
+    try:
+        await storage.bookings.ensure_indexes()
+    except Exception as e:
+        logger.error(f"❌ Failed to create indexes: {str(e)}")
+
+async def warm_recent_bookings():
+    # Admin reads fall back to the DB until the cache is ready, so keep
+    # retrying through a DB that is still coming up
+    delay = RECENT_CACHE_WARM_BACKOFF
+    for attempt in range(1, RECENT_CACHE_WARM_ATTEMPTS + 1):
+        try:
+            await recent_bookings.warm(storage.bookings)
+            return
+        except Exception as e:
+            if attempt == RECENT_CACHE_WARM_ATTEMPTS:
+                logger.error(f"❌ Failed to warm recent bookings cache after {attempt} attempts: {str(e)}")
+                return
+            logger.warning(f"⚠️ Warming recent bookings cache failed (attempt {attempt}), retrying in {delay:.0f}s: {str(e)}")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, RECENT_CACHE_WARM_MAX_DELAY)
+
+async def _run_startup_task(hook):
+    start = time.perf_counter()
+    try:
+        await hook()
+    finally:
+        startup_timings[hook.__name__] = (time.perf_counter() - start) * 1000
+
+@app.on_event("startup")
+async def schedule_startup_tasks():
+    """Defer DB-bound startup work so the app can serve immediately"""
+    for hook in (warm_sanitizer, seed_admin, ensure_indexes, warm_recent_bookings):
+        startup_tasks[hook.__name__] = asyncio.create_task(_run_startup_task(hook))
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    for task in startup_tasks.values():
+        if not task.done():
+            task.cancel()
+    if _email_tasks:
+        # Let in-flight confirmations finish rather than dropping them
+        await asyncio.wait(list(_email_tasks), timeout=10)
+    trace_recorder.flush()
+    for job in export_jobs.values():
+        if job.get("task") is not None:
+            job["task"].cancel()
+    await storage.close()
+
+
+# ─── Startup Profiler ────────────────────────────────────
+def profile_startup() -> dict:
+    """Report import-time and startup-hook breakdown for a cold start.
+
+    Imports are measured in a fresh interpreter with ``-X importtime`` so
+    modules already loaded in this process don't hide their cost.
+    """
+    import subprocess
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=str(ROOT_DIR), capture_output=True, text=True
+    )
+    # Direct imports of server.py are the depth-1 entries listed just
+    # before the depth-0 "server" line; "server" itself is the total.
+    imports, pending, total_ms = [], [], 0.0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            if name.strip() == "server":
+                imports, total_ms = pending, int(cumulative_us) / 1000
+            pending = []
+        elif depth == 1:
+            pending.append({"module": name.strip(), "cumulative_ms": int(cumulative_us) / 1000})
+    imports.sort(key=lambda m: m["cumulative_ms"], reverse=True)
+
+    async def run_hooks():
+        hooks = []
+        for hook in app.router.on_startup:
+            start = time.perf_counter()
+            await hook()
+            hooks.append({"hook": hook.__name__, "ms": (time.perf_counter() - start) * 1000})
+        # Background tasks overlap, so report how long each one ran
+        await asyncio.gather(*startup_tasks.values(), return_exceptions=True)
+        for name in startup_tasks:
+            hooks.append({"hook": f"{name} (background)", "ms": startup_timings.get(name, 0.0)})
+        for hook in app.router.on_shutdown:
+            await hook()
+        return hooks
+
+    hooks = asyncio.run(run_hooks())
+    return {
+        "import_total_ms": total_ms,
+        "imports": imports,
+        "startup_hooks": hooks,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TIVROX API server")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print import-time and startup-hook breakdown, then exit")
+    parser.add_argument("--top", type=int, default=15, help="number of imports to show")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        report = profile_startup()
+        print(f"Imports: {report['import_total_ms']:.1f} ms total")
+        for m in report["imports"][:args.top]:
+            print(f"  {m['cumulative_ms']:9.1f} ms  {m['module']}")
+        print("Startup hooks:")
+        for h in report["startup_hooks"]:
+            print(f"  {h['ms']:9.1f} ms  {h['hook']}")
+    else:
+        import uvicorn
+        uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,536 @@
+"""
+Storage backends for bookings and admin users.
+
+Routes in server.py go through ``storage.bookings`` (BookingStore) and
+``storage.admins`` (AdminStore) instead of a Motor database directly.
+STORAGE_BACKEND selects the engine:
+
+- ``mongo`` (default): MongoDB via Motor, using MONGO_URL and DB_NAME
+- ``sqlite``: embedded SQLite at SQLITE_PATH (``:memory:`` by default), so
+  the app can run, be load-tested and profiled without a MongoDB server
+
+Both engines return plain dicts without Mongo's ``_id`` and share the same
+filter, sort (newest first unless noted), count and grouping semantics.
+
+Every insert and update stamps ``modified_at`` with the server time of the
+write, on the dict passed in. Delta exports page on it, since imported rows
+keep their historical ``created_at``.
+"""
+import asyncio
+import functools
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# ─── Interfaces ───────────────────────────────────────────
+class BookingStore(ABC):
+    @abstractmethod
+    async def ensure_indexes(self):
+        ...
+
+    @abstractmethod
+    async def insert(self, booking: dict):
+        ...
+
+    @abstractmethod
+    async def insert_many(self, bookings: List[dict]) -> List[dict]:
+        """Insert what it can, skipping duplicate ids; returns the inserted docs"""
+
+    @abstractmethod
+    async def list(self, service: Optional[str] = None, status: Optional[str] = None,
+                   limit: Optional[int] = None) -> List[dict]:
+        """Newest-first bookings matching the filters, without ip_address"""
+
+    @abstractmethod
+    async def count(self, service: Optional[str] = None, status: Optional[str] = None) -> int:
+        ...
+
+    @abstractmethod
+    async def count_by_service(self) -> Dict[str, int]:
+        ...
+
+    @abstractmethod
+    async def count_changed_since(self, since: Optional[str]) -> int:
+        ...
+
+    @abstractmethod
+    def iter_changed_since(self, since: Optional[str]) -> AsyncIterator[dict]:
+        """Bookings with ``modified_at`` after ``since``, in ``modified_at`` order, without ip_address"""
+
+    @abstractmethod
+    async def get(self, booking_id: str, fields: Iterable[str]) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def get_many(self, ids: List[str], fields: Iterable[str]) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def find_existing(self, ids: List[str], keys: List[Tuple[str, str]]) -> List[dict]:
+        """Bookings matching any id or any (email, created_at) pair"""
+
+    @abstractmethod
+    async def update(self, booking_id: str, fields: dict) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete(self, booking_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete_many(self, ids: List[str]) -> int:
+        ...
+
+
+class AdminStore(ABC):
+    @abstractmethod
+    async def find_by_username(self, username: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def insert(self, admin: dict):
+        ...
+
+
+class Storage:
+    name = ""
+    bookings: BookingStore
+    admins: AdminStore
+    _last_stamp: Optional[datetime] = None
+
+    def stamp(self) -> str:
+        """Strictly increasing write time, so a cursor never ties with a later write"""
+        now = datetime.now(timezone.utc)
+        if self._last_stamp is not None and now <= self._last_stamp:
+            now = self._last_stamp + timedelta(microseconds=1)
+        self._last_stamp = now
+        return now.isoformat(timespec="microseconds")
+
+    async def close(self):
+        pass
+
+
+def _changed_since_query(since: Optional[str]) -> dict:
+    if not since:
+        return {}
+    return {"modified_at": {"$gt": since}}
+
+
+def _filters(service: Optional[str], status: Optional[str]) -> dict:
+    query = {}
+    if service:
+        query["service"] = service
+    if status:
+        query["status"] = status
+    return query
+
+
+# ─── MongoDB (Motor) ──────────────────────────────────────
+class MongoStorage(Storage):
+    name = "mongo"
+
+    def __init__(self, url: Optional[str], db_name: Optional[str]):
+        self.url = url
+        self.db_name = db_name
+        self.client = None
+        self.bookings = MongoBookingStore(self)
+        self.admins = MongoAdminStore(self)
+
+    @property
+    def db(self):
+        # Created on first use so importing the app stays cheap (cold starts)
+        if self.client is None:
+            if not self.url:
+                raise RuntimeError("MONGO_URL is not set")
+            from motor.motor_asyncio import AsyncIOMotorClient
+            self.client = AsyncIOMotorClient(self.url)
+        return self.client[self.db_name]
+
+    async def close(self):
+        if self.client is not None:
+            self.client.close()
+
+
+class MongoBookingStore(BookingStore):
+    LIST_PROJECTION = {"_id": 0, "ip_address": 0}
+
+    def __init__(self, storage: MongoStorage):
+        self._storage = storage
+
+    @property
+    def _col(self):
+        return self._storage.db.bookings
+
+    async def ensure_indexes(self):
+        # Each index on its own, so one failure doesn't leave the rest missing
+        for field, unique in (("id", True), ("created_at", False), ("updated_at", False), ("modified_at", False)):
+            try:
+                await self._col.create_index(field, unique=unique)
+            except Exception as e:
+                if unique:
+                    logger.critical(f"🚨 Unique index on bookings.{field} could not be created; duplicate "
+                                    f"ids are not prevented until existing duplicates are removed: {str(e)}")
+                else:
+                    logger.error(f"❌ Failed to create index on bookings.{field}: {str(e)}")
+        try:
+            # Bookings written before modified_at existed
+            await self._col.update_many(
+                {"modified_at": {"$exists": False}},
+                [{"$set": {"modified_at": {"$ifNull": ["$updated_at", "$created_at"]}}}]
+            )
+        except Exception as e:
+            logger.error(f"❌ Failed to backfill bookings.modified_at: {str(e)}")
+
+    async def insert(self, booking: dict):
+        booking["modified_at"] = self._storage.stamp()
+        # insert_one adds _id to the dict it is given
+        await self._col.insert_one(dict(booking))
+
+    async def insert_many(self, bookings: List[dict]) -> List[dict]:
+        if not bookings:
+            return []
+        for booking in bookings:
+            booking["modified_at"] = self._storage.stamp()
+        try:
+            await self._col.insert_many([dict(b) for b in bookings], ordered=False)
+            return list(bookings)
+        except Exception as e:
+            # Unordered inserts keep going past duplicate-key errors
+            details = getattr(e, "details", None)
+            if not details:
+                raise
+            failed = {err["index"] for err in details.get("writeErrors", [])}
+            return [b for i, b in enumerate(bookings) if i not in failed]
+
+    async def list(self, service=None, status=None, limit=None) -> List[dict]:
+        cursor = self._col.find(_filters(service, status), self.LIST_PROJECTION).sort("created_at", -1)
+        return await cursor.to_list(limit)
+
+    async def count(self, service=None, status=None) -> int:
+        return await self._col.count_documents(_filters(service, status))
+
+    async def count_by_service(self) -> Dict[str, int]:
+        pipeline = [{"$group": {"_id": "$service", "count": {"$sum": 1}}}]
+        rows = await self._col.aggregate(pipeline).to_list(None)
+        return {r["_id"]: r["count"] for r in rows if r["_id"]}
+
+    async def count_changed_since(self, since) -> int:
+        return await self._col.count_documents(_changed_since_query(since))
+
+    async def iter_changed_since(self, since):
+        cursor = self._col.find(_changed_since_query(since), self.LIST_PROJECTION).sort("modified_at", 1)
+        async for booking in cursor:
+            yield booking
+
+    async def get(self, booking_id, fields) -> Optional[dict]:
+        return await self._col.find_one({"id": booking_id}, {"_id": 0, **{f: 1 for f in fields}})
+
+    async def get_many(self, ids, fields) -> List[dict]:
+        cursor = self._col.find({"id": {"$in": list(ids)}}, {"_id": 0, **{f: 1 for f in fields}})
+        return await cursor.to_list(None)
+
+    async def find_existing(self, ids, keys) -> List[dict]:
+        query = {"$or": [
+            {"id": {"$in": list(ids)}},
+            *({"email": email, "created_at": created_at} for email, created_at in keys),
+        ]}
+        return await self._col.find(query, {"_id": 0, "id": 1, "email": 1, "created_at": 1}).to_list(None)
+
+    async def update(self, booking_id, fields) -> bool:
+        fields["modified_at"] = self._storage.stamp()
+        result = await self._col.update_one({"id": booking_id}, {"$set": fields})
+        return result.matched_count > 0
+
+    async def delete(self, booking_id) -> bool:
+        result = await self._col.delete_one({"id": booking_id})
+        return result.deleted_count > 0
+
+    async def delete_many(self, ids) -> int:
+        result = await self._col.delete_many({"id": {"$in": list(ids)}})
+        return result.deleted_count
+
+
+class MongoAdminStore(AdminStore):
+    def __init__(self, storage: MongoStorage):
+        self._storage = storage
+
+    async def find_by_username(self, username) -> Optional[dict]:
+        return await self._storage.db.admins.find_one({"username": username}, {"_id": 0})
+
+    async def insert(self, admin: dict):
+        await self._storage.db.admins.insert_one(dict(admin))
+
+
+# ─── Embedded SQLite ──────────────────────────────────────
+# Documents are stored as JSON next to the columns that are filtered or
+# sorted on. One connection lives on a single worker thread, so calls are
+# serialized like a small connection pool and never block the event loop.
+class SQLiteStorage(Storage):
+    name = "sqlite"
+    PAGE_SIZE = 500
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS bookings (
+            id TEXT PRIMARY KEY,
+            created_at TEXT,
+            updated_at TEXT,
+            modified_at TEXT,
+            service TEXT,
+            status TEXT,
+            email TEXT,
+            doc TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS admins (
+            username TEXT PRIMARY KEY,
+            doc TEXT NOT NULL
+        );
+    """
+    INDEXES = """
+        CREATE INDEX IF NOT EXISTS bookings_created_at ON bookings (created_at, id);
+        CREATE INDEX IF NOT EXISTS bookings_updated_at ON bookings (updated_at);
+        CREATE INDEX IF NOT EXISTS bookings_modified_at ON bookings (modified_at, id);
+        CREATE INDEX IF NOT EXISTS bookings_service ON bookings (service, created_at);
+        CREATE INDEX IF NOT EXISTS bookings_status ON bookings (status, created_at);
+        CREATE INDEX IF NOT EXISTS bookings_email ON bookings (email, created_at);
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self.bookings = SQLiteBookingStore(self)
+        self.admins = SQLiteAdminStore(self)
+
+    def _connection(self):
+        if self._conn is None:
+            import sqlite3
+            self._conn = sqlite3.connect(self.path)
+            self._conn.row_factory = sqlite3.Row
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+            self._migrate(self._conn)
+        return self._conn
+
+    @staticmethod
+    def _migrate(conn):
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(bookings)")}
+        if "modified_at" not in columns:
+            with conn:
+                conn.execute("ALTER TABLE bookings ADD COLUMN modified_at TEXT")
+                conn.execute("UPDATE bookings SET modified_at = COALESCE(updated_at, created_at)")
+
+    async def run(self, fn, *args):
+        """Run ``fn(conn, *args)`` on the storage thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(self._call, fn, *args))
+
+    def _call(self, fn, *args):
+        conn = self._connection()
+        with conn:
+            return fn(conn, *args)
+
+    async def close(self):
+        def _close(_):
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        await asyncio.get_running_loop().run_in_executor(self._executor, _close, None)
+        self._executor.shutdown(wait=False)
+
+
+def _row_columns(doc: dict) -> tuple:
+    return (doc["id"], doc.get("created_at"), doc.get("updated_at"), doc.get("modified_at"),
+            doc.get("service"), doc.get("status"), doc.get("email"), json.dumps(doc))
+
+
+def _where(service: Optional[str], status: Optional[str]) -> Tuple[str, list]:
+    clauses, params = [], []
+    if service:
+        clauses.append("service = ?")
+        params.append(service)
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _public(doc: dict) -> dict:
+    doc.pop("ip_address", None)
+    return doc
+
+
+def _project(doc: dict, fields: Iterable[str]) -> dict:
+    return {f: doc[f] for f in fields if f in doc}
+
+
+class SQLiteBookingStore(BookingStore):
+    INSERT = ("INSERT INTO bookings (id, created_at, updated_at, modified_at, service, status, email, doc) "
+              "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+
+    def __init__(self, storage: SQLiteStorage):
+        self._storage = storage
+
+    async def ensure_indexes(self):
+        await self._storage.run(lambda conn: conn.executescript(SQLiteStorage.INDEXES))
+
+    # Stamps are taken on the storage thread, so they follow commit order
+    async def insert(self, booking: dict):
+        def _insert(conn):
+            booking["modified_at"] = self._storage.stamp()
+            conn.execute(self.INSERT, _row_columns(booking))
+        await self._storage.run(_insert)
+
+    async def insert_many(self, bookings: List[dict]) -> List[dict]:
+        def _insert(conn):
+            inserted = []
+            for booking in bookings:
+                booking["modified_at"] = self._storage.stamp()
+                cur = conn.execute(self.INSERT.replace("INSERT", "INSERT OR IGNORE", 1), _row_columns(booking))
+                if cur.rowcount:
+                    inserted.append(booking)
+            return inserted
+        return await self._storage.run(_insert)
+
+    async def list(self, service=None, status=None, limit=None) -> List[dict]:
+        where, params = _where(service, status)
+        sql = f"SELECT doc FROM bookings{where} ORDER BY created_at DESC, id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = await self._storage.run(lambda conn: conn.execute(sql, params).fetchall())
+        return [_public(json.loads(r["doc"])) for r in rows]
+
+    async def count(self, service=None, status=None) -> int:
+        where, params = _where(service, status)
+        return await self._storage.run(
+            lambda conn: conn.execute(f"SELECT COUNT(*) FROM bookings{where}", params).fetchone()[0]
+        )
+
+    async def count_by_service(self) -> Dict[str, int]:
+        rows = await self._storage.run(
+            lambda conn: conn.execute("SELECT service, COUNT(*) AS n FROM bookings GROUP BY service").fetchall()
+        )
+        return {r["service"]: r["n"] for r in rows if r["service"]}
+
+    @staticmethod
+    def _since_clause(since: Optional[str]) -> Tuple[str, list]:
+        if not since:
+            return "1 = 1", []
+        return "modified_at > ?", [since]
+
+    async def count_changed_since(self, since) -> int:
+        clause, params = self._since_clause(since)
+        return await self._storage.run(
+            lambda conn: conn.execute(f"SELECT COUNT(*) FROM bookings WHERE {clause}", params).fetchone()[0]
+        )
+
+    async def iter_changed_since(self, since):
+        # Keyset pagination keeps memory bounded for large exports
+        clause, params = self._since_clause(since)
+        last = ("", "")
+        while True:
+            sql = (f"SELECT modified_at, id, doc FROM bookings WHERE {clause} AND (modified_at, id) > (?, ?) "
+                   f"ORDER BY modified_at, id LIMIT {SQLiteStorage.PAGE_SIZE}")
+            rows = await self._storage.run(lambda conn, p=params + list(last): conn.execute(sql, p).fetchall())
+            for row in rows:
+                # The column is authoritative: migrated rows only have it there
+                yield _public({**json.loads(row["doc"]), "modified_at": row["modified_at"]})
+            if len(rows) < SQLiteStorage.PAGE_SIZE:
+                return
+            last = (rows[-1]["modified_at"], rows[-1]["id"])
+
+    async def get(self, booking_id, fields) -> Optional[dict]:
+        row = await self._storage.run(
+            lambda conn: conn.execute("SELECT doc FROM bookings WHERE id = ?", (booking_id,)).fetchone()
+        )
+        return _project(json.loads(row["doc"]), fields) if row else None
+
+    async def get_many(self, ids, fields) -> List[dict]:
+        ids = list(ids)
+        if not ids:
+            return []
+        marks = ",".join("?" * len(ids))
+        rows = await self._storage.run(
+            lambda conn: conn.execute(f"SELECT doc FROM bookings WHERE id IN ({marks})", ids).fetchall()
+        )
+        return [_project(json.loads(r["doc"]), fields) for r in rows]
+
+    async def find_existing(self, ids, keys) -> List[dict]:
+        def _find(conn):
+            found = {}
+            id_list = list(ids)
+            for start in range(0, len(id_list), 500):
+                chunk = id_list[start:start + 500]
+                sql = f"SELECT id, email, created_at FROM bookings WHERE id IN ({','.join('?' * len(chunk))})"
+                for row in conn.execute(sql, chunk):
+                    found[row["id"]] = dict(row)
+            for email, created_at in keys:
+                sql = "SELECT id, email, created_at FROM bookings WHERE email = ? AND created_at = ?"
+                for row in conn.execute(sql, (email, created_at)):
+                    found[row["id"]] = dict(row)
+            return list(found.values())
+        return await self._storage.run(_find)
+
+    async def update(self, booking_id, fields) -> bool:
+        def _update(conn):
+            row = conn.execute("SELECT doc FROM bookings WHERE id = ?", (booking_id,)).fetchone()
+            if row is None:
+                return False
+            fields["modified_at"] = self._storage.stamp()
+            doc = {**json.loads(row["doc"]), **fields}
+            conn.execute(
+                "UPDATE bookings SET created_at = ?, updated_at = ?, modified_at = ?, service = ?, status = ?, "
+                "email = ?, doc = ? WHERE id = ?",
+                _row_columns(doc)[1:] + (booking_id,)
+            )
+            return True
+        return await self._storage.run(_update)
+
+    async def delete(self, booking_id) -> bool:
+        return await self._storage.run(
+            lambda conn: conn.execute("DELETE FROM bookings WHERE id = ?", (booking_id,)).rowcount > 0
+        )
+
+    async def delete_many(self, ids) -> int:
+        ids = list(ids)
+        if not ids:
+            return 0
+        marks = ",".join("?" * len(ids))
+        return await self._storage.run(
+            lambda conn: conn.execute(f"DELETE FROM bookings WHERE id IN ({marks})", ids).rowcount
+        )
+
+
+class SQLiteAdminStore(AdminStore):
+    def __init__(self, storage: SQLiteStorage):
+        self._storage = storage
+
+    async def find_by_username(self, username) -> Optional[dict]:
+        row = await self._storage.run(
+            lambda conn: conn.execute("SELECT doc FROM admins WHERE username = ?", (username,)).fetchone()
+        )
+        return json.loads(row["doc"]) if row else None
+
+    async def insert(self, admin: dict):
+        await self._storage.run(
+            lambda conn: conn.execute("INSERT INTO admins (username, doc) VALUES (?, ?)",
+                                      (admin["username"], json.dumps(admin)))
+        )
+
+
+# ─── Factory ──────────────────────────────────────────────
+def open_storage(backend: Optional[str] = None) -> Storage:
+    backend = (backend or os.environ.get("STORAGE_BACKEND", "mongo")).lower()
+    if backend == "mongo":
+        return MongoStorage(os.environ.get("MONGO_URL"), os.environ.get("DB_NAME"))
+    if backend == "sqlite":
+        return SQLiteStorage(os.environ.get("SQLITE_PATH", ":memory:"))
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
@@ -0,0 +1,48 @@
+// precompress.js
+// Writes .br and .gz siblings for compressible build output so the backend
+// can serve them directly (see FRONTEND_BUILD_DIR in backend/server.py).
+
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+const BUILD_DIR = path.resolve(process.argv[2] || path.join(__dirname, '..', 'build'));
+const COMPRESSIBLE = /\.(js|css|html|json|svg|txt|map|ico|webmanifest)$/;
+const MIN_SIZE = 1024;
+
+function walk(dir) {
+  return fs.readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+    const full = path.join(dir, entry.name);
+    return entry.isDirectory() ? walk(full) : [full];
+  });
+}
+
+function precompress() {
+  if (!fs.existsSync(BUILD_DIR)) {
+    console.warn('[Precompress] No build directory, skipping');
+    return;
+  }
+
+  let count = 0;
+  for (const file of walk(BUILD_DIR)) {
+    if (!COMPRESSIBLE.test(file)) continue;
+    const source = fs.readFileSync(file);
+    if (source.length < MIN_SIZE) continue;
+
+    const brotli = zlib.brotliCompressSync(source, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: source.length,
+      },
+    });
+    const gzip = zlib.gzipSync(source, { level: zlib.constants.Z_BEST_COMPRESSION });
+
+    // Only keep variants that actually save bytes
+    if (brotli.length < source.length) fs.writeFileSync(`${file}.br`, brotli);
+    if (gzip.length < source.length) fs.writeFileSync(`${file}.gz`, gzip);
+    count += 1;
+  }
+  console.log(`[Precompress] Compressed ${count} files in ${BUILD_DIR}`);
+}
+
+precompress();
@@ -52,12 +52,9 @@ export default function AdminDashboard() {
       if (serviceFilter !== "all") params.service = serviceFilter;
       if (statusFilter !== "all") params.status = statusFilter;
 
-      const [bookingsRes, statsRes] = await Promise.all([
-        axios.get(`${API}/admin/bookings`, { headers: authHeaders, params }),
-        axios.get(`${API}/admin/stats`, { headers: authHeaders })
-      ]);
-      setBookings(bookingsRes.data.bookings);
-      setStats(statsRes.data);
+      const res = await axios.get(`${API}/admin/dashboard`, { headers: authHeaders, params });
+      setBookings(res.data.bookings);
+      setStats(res.data.stats);
     } catch (err) {
       if (err.response?.status === 401) {
         localStorage.removeItem("tivrox_admin_token");
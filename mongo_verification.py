@@ -3,27 +3,29 @@
 MongoDB Verification Test - Check if booking was saved
 """
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
+import sys
 from dotenv import load_dotenv
 from pathlib import Path
 
 # Load environment
 ROOT_DIR = Path(__file__).parent / "backend"
 load_dotenv(ROOT_DIR / '.env')
+sys.path.insert(0, str(ROOT_DIR))
+
+from storage import open_storage  # noqa: E402
 
 async def verify_booking_in_db(booking_id):
-    """Verify the booking was saved to MongoDB"""
-    mongo_url = os.environ['MONGO_URL']
-    client = AsyncIOMotorClient(mongo_url)
-    db = client[os.environ['DB_NAME']]
+    """Verify the booking was saved (STORAGE_BACKEND selects MongoDB or SQLite)"""
+    storage = open_storage()
     
     try:
         # Find the booking
-        booking = await db.bookings.find_one({"id": booking_id}, {"_id": 0})
+        booking = await storage.bookings.get(
+            booking_id, ("id", "full_name", "email", "service", "status", "created_at")
+        )
         
         if booking:
-            print("✅ SUCCESS: Booking found in MongoDB!")
+            print(f"✅ SUCCESS: Booking found in {storage.name}!")
             print(f"📋 Booking Details:")
             print(f"   ID: {booking['id']}")
             print(f"   Name: {booking['full_name']}")
@@ -33,23 +35,23 @@ async def verify_booking_in_db(booking_id):
             print(f"   Created: {booking['created_at']}")
             return True
         else:
-            print("❌ FAILED: Booking not found in MongoDB")
+            print(f"❌ FAILED: Booking not found in {storage.name}")
             return False
             
     except Exception as e:
-        print(f"❌ ERROR checking MongoDB: {e}")
+        print(f"❌ ERROR checking {storage.name}: {e}")
         return False
     finally:
-        client.close()
+        await storage.close()
 
 if __name__ == "__main__":
     # Test the booking ID from our test
-    booking_id = "722b3574-3dd7-4c74-b8e7-3b561a1c8532"
-    print(f"🔍 Verifying booking {booking_id} in MongoDB...")
+    booking_id = sys.argv[1] if len(sys.argv) > 1 else "722b3574-3dd7-4c74-b8e7-3b561a1c8532"
+    print(f"🔍 Verifying booking {booking_id} in the database...")
     
     result = asyncio.run(verify_booking_in_db(booking_id))
     
     if result:
-        print("🎉 MongoDB verification PASSED!")
+        print("🎉 Database verification PASSED!")
     else:
-        print("⚠️ MongoDB verification FAILED!")
\ No newline at end of file
+        print("⚠️ Database verification FAILED!")
\ No newline at end of file
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+TIVROX Booking Soak Test - Concurrency and fault injection
+
+Runs many concurrent POST /api/bookings submissions against the app
+in-process, on the embedded SQLite store and a stub email transport,
+while injecting DB timeouts, slow email sends and event-loop stalls.
+
+Checks:
+  - no booking is lost (every returned booking_id is in the store)
+  - every accepted booking got its emails, is in the recent bookings cache
+    and is visible through the public status endpoint
+  - booking latency stays within budget
+  - check_rate_limit holds its limit under concurrent calls
+
+Usage:
+  python soak_test.py --bookings 500 --concurrency 50
+  python soak_test.py --db-fault-rate 0.2 --email-delay 0.5 --stall-ms 50
+  python soak_test.py --db-fault-mode after   # writes land, acks time out
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+import httpx  # noqa: E402
+import server  # noqa: E402
+from storage import SQLiteStorage  # noqa: E402
+
+
+# ─── Storage Stand-in ────────────────────────────────────
+class FaultyBookingStore:
+    """Wraps an embedded BookingStore; inserts time out on a schedule.
+
+    A faulted booking fails its first ``max_failures`` insert attempts,
+    which stays below the handler's retry count so nothing should be lost.
+    In ``before`` mode the timeout hits before the write; in ``after`` mode
+    the write lands and only the acknowledgement is lost, so a retry finds
+    the booking already stored. ``mixed`` picks one per faulted booking.
+    """
+
+    def __init__(self, store, fault_rate: float, fault_delay: float, max_failures: int, mode: str = "before"):
+        self.store = store
+        self.fault_rate = fault_rate
+        self.fault_delay = fault_delay
+        self.max_failures = max_failures
+        self.mode = mode
+        self.attempts = {}
+        self.faulted = {}
+        self.injected = 0
+        self.lost_acks = 0
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+    async def insert(self, booking):
+        key = booking["id"]
+        attempt = self.attempts.get(key, 0)
+        self.attempts[key] = attempt + 1
+        if attempt == 0 and random.random() < self.fault_rate:
+            self.faulted[key] = random.choice(["before", "after"]) if self.mode == "mixed" else self.mode
+        if key in self.faulted and attempt < self.max_failures:
+            self.injected += 1
+            if self.faulted[key] == "after":
+                # Raises on a duplicate id, just like a real retried insert
+                await self.store.insert(booking)
+                self.lost_acks += 1
+            await asyncio.sleep(self.fault_delay)
+            raise TimeoutError(f"injected DB timeout (attempt {attempt + 1})")
+        await self.store.insert(booking)
+
+
+# ─── Email Stand-in ──────────────────────────────────────
+class StubEmails:
+    def __init__(self, delay: float, failure_rate: float):
+        self.delay = delay
+        self.failure_rate = failure_rate
+        self.attempted = []
+        self.sent = []
+
+    def send(self, params):
+        # Blocking on purpose: resend's client is synchronous
+        self.attempted.append(params)
+        time.sleep(self.delay)
+        if random.random() < self.failure_rate:
+            raise ConnectionError("injected email failure")
+        self.sent.append(params)
+        return {"id": "stub"}
+
+
+class StubResend:
+    def __init__(self, emails):
+        self.Emails = emails
+        self.api_key = "stub"
+
+
+# ─── Load Generation ─────────────────────────────────────
+def make_booking(i: int) -> dict:
+    return {
+        "full_name": f"Soak User {i}",
+        "email": f"soak{i}@example.com",
+        "phone": f"+1555{i:07d}",
+        "service": random.choice(["Website Development", "App Development", "Video Editing", "Graphic Design"]),
+        "project_deadline": "2026-12-31",
+        "project_description": f"Soak test booking number {i}",
+    }
+
+
+async def stall_loop(stall_ms: float, every_ms: float, stop: asyncio.Event):
+    """Block the event loop periodically, like a CPU-bound handler would"""
+    stalls = 0
+    while not stop.is_set():
+        await asyncio.sleep(every_ms / 1000)
+        time.sleep(stall_ms / 1000)
+        stalls += 1
+    return stalls
+
+
+async def submit_all(client, count: int, concurrency: int):
+    sem = asyncio.Semaphore(concurrency)
+    results = []
+
+    async def one(i):
+        async with sem:
+            start = time.perf_counter()
+            # Unique client IP per booking so the rate limit doesn't interfere
+            headers = {"X-Forwarded-For": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"}
+            resp = await client.post("/api/bookings", json=make_booking(i), headers=headers)
+            elapsed = time.perf_counter() - start
+            body = resp.json() if resp.headers.get("content-type", "").startswith("application/json") else {}
+            results.append({"status": resp.status_code, "booking_id": body.get("booking_id"), "latency": elapsed})
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return results
+
+
+async def check_status(client, booking_ids, concurrency: int = 8):
+    """Booking IDs the public status endpoint can't show"""
+    sem = asyncio.Semaphore(concurrency)
+    missing = []
+
+    async def one(i, booking_id):
+        async with sem:
+            headers = {"X-Forwarded-For": f"172.16.{i // 256 % 256}.{i % 256}"}
+            resp = await client.get(f"/api/bookings/{booking_id}/status", headers=headers)
+            if resp.status_code != 200:
+                missing.append(booking_id)
+
+    await asyncio.gather(*(one(i, b) for i, b in enumerate(booking_ids)))
+    return missing
+
+
+def emailed_bookings(emails: StubEmails):
+    """(admin notifications, booking IDs with a client confirmation) attempted"""
+    admin = sum(1 for p in emails.attempted if p["to"] == server.ADMIN_EMAIL)
+    confirmed = set()
+    for p in emails.attempted:
+        match = re.search(r"Booking ID: (\S+)", p["text"])
+        if p["to"] != server.ADMIN_EMAIL and match:
+            confirmed.add(match.group(1))
+    return admin, confirmed
+
+
+async def rate_limit_burst(client, attempts: int):
+    """Fire a concurrent burst from one IP; exactly RATE_LIMIT_MAX may pass"""
+    headers = {"X-Forwarded-For": "192.0.2.77"}
+    resps = await asyncio.gather(*(
+        client.post("/api/bookings", json=make_booking(100000 + i), headers=headers)
+        for i in range(attempts)
+    ))
+    return [r.status_code for r in resps]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True).strip()
+    except Exception:
+        return None
+
+
+# ─── Main ────────────────────────────────────────────────
+async def run(args):
+    random.seed(args.seed)
+    storage = SQLiteStorage(args.sqlite_path)
+    faulty = FaultyBookingStore(storage.bookings, fault_rate=args.db_fault_rate, fault_delay=args.db_fault_delay,
+                                max_failures=args.db_max_failures, mode=args.db_fault_mode)
+    storage.bookings = faulty
+    emails = StubEmails(delay=args.email_delay, failure_rate=args.email_failure_rate)
+    server.storage = storage
+    server.resend = StubResend(emails)
+    server.rate_limit_store.clear()
+    server.status_rate_limit_store.clear()
+    # Warm on the empty store, as startup would, so new bookings are cached
+    server.recent_bookings = server.RecentBookingsCache(args.bookings + args.burst)
+    await server.recent_bookings.warm(storage.bookings)
+
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://soak") as client:
+        stop = asyncio.Event()
+        staller = asyncio.create_task(stall_loop(args.stall_ms, args.stall_every_ms, stop)) if args.stall_ms else None
+
+        wall_start = time.perf_counter()
+        results = await submit_all(client, args.bookings, args.concurrency)
+        wall = time.perf_counter() - wall_start
+
+        burst = await rate_limit_burst(client, args.burst)
+
+        stop.set()
+        stalls = await staller if staller else 0
+
+        # Emails are sent after the response; wait for them before counting
+        if server._email_tasks:
+            await asyncio.wait(list(server._email_tasks), timeout=60)
+
+        ok = [r for r in results if r["status"] == 200]
+        accepted_ids = [r["booking_id"] for r in ok]
+        status_missing = await check_status(client, accepted_ids)
+
+    stored = {d["id"] for d in await storage.bookings.list()}
+    await storage.close()
+    lost = [b for b in accepted_ids if b not in stored]
+    uncached = [b for b in accepted_ids if b not in server.recent_bookings.entries]
+    admin_emails, confirmed = emailed_bookings(emails)
+    unemailed = [b for b in accepted_ids if b not in confirmed]
+    latencies = [r["latency"] for r in results]
+    burst_ok = burst.count(200)
+    p95 = percentile(latencies, 95)
+
+    checks = {
+        "all_accepted": len(ok) == args.bookings,
+        "no_booking_lost": not lost,
+        # Burst bookings also email, so admin notifications cover both phases
+        "emails_for_every_booking": not unemailed and admin_emails == len(accepted_ids) + burst.count(200),
+        "cache_has_every_booking": not uncached,
+        "status_shows_every_booking": not status_missing,
+        "latency_p95_within_budget": p95 <= args.budget_p95,
+        "rate_limit_holds": burst_ok == server.RATE_LIMIT_MAX and burst.count(429) == args.burst - burst_ok,
+    }
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": vars(args),
+        "bookings": {
+            "submitted": args.bookings,
+            "accepted": len(ok),
+            "stored": len(stored),
+            "lost": len(lost),
+            "lost_ids": lost[:20],
+            "unemailed_ids": unemailed[:20],
+            "uncached_ids": uncached[:20],
+            "status_missing_ids": status_missing[:20],
+        },
+        "latency_ms": {
+            "p50": round(statistics.median(latencies) * 1000, 2) if latencies else 0,
+            "p95": round(p95 * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(max(latencies) * 1000, 2) if latencies else 0,
+            "budget_p95": args.budget_p95 * 1000,
+        },
+        "throughput_rps": round(args.bookings / wall, 1) if wall else 0,
+        "faults": {
+            "db_timeouts_injected": faulty.injected,
+            "db_writes_with_lost_ack": faulty.lost_acks,
+            "event_loop_stalls": stalls,
+            "emails_attempted": len(emails.attempted),
+            "emails_sent": len(emails.sent),
+        },
+        "rate_limit": {"burst": args.burst, "allowed": burst_ok, "limit": server.RATE_LIMIT_MAX},
+        "checks": checks,
+        "passed": all(checks.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TIVROX booking soak test")
+    parser.add_argument("--bookings", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--db-fault-rate", type=float, default=0.1, help="fraction of bookings whose inserts time out")
+    parser.add_argument("--db-fault-delay", type=float, default=0.05, help="seconds before an injected DB timeout")
+    parser.add_argument("--db-max-failures", type=int, default=2, help="failed attempts per faulted booking")
+    parser.add_argument("--db-fault-mode", choices=["before", "after", "mixed"], default="mixed",
+                        help="time out before the write, after it (lost ack), or either")
+    parser.add_argument("--email-delay", type=float, default=0.2, help="seconds per stub email send")
+    parser.add_argument("--email-failure-rate", type=float, default=0.05)
+    parser.add_argument("--stall-ms", type=float, default=20, help="event-loop stall length (0 disables)")
+    parser.add_argument("--stall-every-ms", type=float, default=200)
+    parser.add_argument("--burst", type=int, default=20, help="concurrent requests from one IP")
+    parser.add_argument("--budget-p95", type=float, default=2.0, help="p95 latency budget in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--sqlite-path", default=":memory:", help="embedded store location")
+    parser.add_argument("--verbose", action="store_true", help="show server logs")
+    parser.add_argument("--report", default=str(ROOT_DIR / "test_reports" / "soak_report.json"))
+    parser.add_argument("--history", default=str(ROOT_DIR / "test_reports" / "soak_history.jsonl"))
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Injected faults are expected; keep only the critical lines
+        server.logger.setLevel("CRITICAL")
+
+    print("=" * 70)
+    print("TIVROX BOOKING SOAK TEST")
+    print("=" * 70)
+    report = asyncio.run(run(args))
+
+    Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    with open(args.history, "a") as f:
+        f.write(json.dumps(report) + "\n")
+
+    b, lat = report["bookings"], report["latency_ms"]
+    print(f"📊 Bookings: {b['accepted']}/{b['submitted']} accepted, {b['stored']} stored, {b['lost']} lost")
+    print(f"⏱️  Latency: p50 {lat['p50']} ms | p95 {lat['p95']} ms | p99 {lat['p99']} ms | max {lat['max']} ms")
+    print(f"🚀 Throughput: {report['throughput_rps']} req/s")
+    print(f"💥 Faults: {report['faults']}")
+    print(f"🛡️  Rate limit: {report['rate_limit']['allowed']}/{report['rate_limit']['burst']} allowed "
+          f"(limit {report['rate_limit']['limit']})")
+    print()
+    for name, passed in report["checks"].items():
+        print(f"{name}: {'✅ PASS' if passed else '❌ FAIL'}")
+    print(f"\n📝 Report written to {args.report}")
+
+    sys.exit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Keep the unit tests off MongoDB and out of the backend directory
+_tmp = Path(tempfile.mkdtemp(prefix="tivrox-tests-"))
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", ":memory:")
+os.environ.setdefault("SPAM_BLOCKLIST_PATH", str(_tmp / "spam_blocklist.txt"))
+os.environ.setdefault("TRACE_LOG_PATH", str(_tmp / "traces.jsonl"))
+os.environ.setdefault("EXPORT_DIR", str(_tmp / "exports"))
+
+
+@pytest.fixture
+def server():
+    import server as module
+    return module
+
+
+@pytest.fixture
+def storage(server, monkeypatch):
+    """Fresh embedded store for tests that read or write bookings"""
+    from storage import SQLiteStorage
+    store = SQLiteStorage(":memory:")
+    monkeypatch.setattr(server, "storage", store)
+    return store
+
+
+@pytest.fixture
+def client(server):
+    from fastapi.testclient import TestClient
+    server.rate_limit_store.clear()
+    return TestClient(server.app)
+
+
+@pytest.fixture
+def admin_client(server, client):
+    server.app.dependency_overrides[server.get_current_admin] = lambda: {"username": "admin"}
+    yield client
+    server.app.dependency_overrides.pop(server.get_current_admin, None)
+
+
+@pytest.fixture
+def live_admin_client(server, storage, monkeypatch):
+    """Admin client on a running app: one event loop for the whole test, so
+    background tasks (export jobs, emails) keep running between requests"""
+    from fastapi.testclient import TestClient
+    monkeypatch.setattr(server, "recent_bookings", server.RecentBookingsCache(100))
+    monkeypatch.setattr(server, "startup_tasks", {})
+    monkeypatch.setattr(server, "export_jobs", {})
+    server.rate_limit_store.clear()
+    server.app.dependency_overrides[server.get_current_admin] = lambda: {"username": "admin"}
+    with TestClient(server.app) as client:
+        yield client
+    server.app.dependency_overrides.pop(server.get_current_admin, None)
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+
+import pytest
+
+from server import AdmissionGate, classify_request
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_admits_up_to_limit_then_queues():
+    async def scenario():
+        gate = AdmissionGate("test", limit=2, max_queue=1, timeout=1)
+        assert await gate.acquire()
+        assert await gate.acquire()
+        queued = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        assert gate.queued == 1
+
+        gate.release()
+        assert await queued
+        assert gate.active == 2
+        assert gate.admitted == 3
+
+    run(scenario())
+
+
+def test_sheds_when_queue_is_full():
+    async def scenario():
+        gate = AdmissionGate("test", limit=1, max_queue=1, timeout=1)
+        assert await gate.acquire()
+        queued = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+
+        assert not await gate.acquire()
+        assert gate.shed == 1
+        queued.cancel()
+
+    run(scenario())
+
+
+def test_queue_timeout_sheds_and_frees_the_slot():
+    async def scenario():
+        gate = AdmissionGate("test", limit=1, max_queue=None, timeout=0.01)
+        assert await gate.acquire()
+        assert not await gate.acquire()
+        assert gate.shed == 1
+
+        # The timed-out waiter must not swallow the released slot
+        gate.release()
+        assert gate.active == 0
+        assert await gate.acquire()
+
+    run(scenario())
+
+
+def test_cancelled_waiter_passes_its_slot_on():
+    async def scenario():
+        gate = AdmissionGate("test", limit=1, max_queue=None, timeout=None)
+        assert await gate.acquire()
+        first = asyncio.create_task(gate.acquire())
+        second = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+
+        # Slot handed to the first waiter, which is cancelled before it runs
+        gate.release()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second
+        assert gate.active == 1
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("method, path, expected", [
+    ("POST", "/api/bookings", "booking"),
+    ("GET", "/api/bookings/abc/status", "status"),
+    ("POST", "/api/admin/login", "login"),
+    ("GET", "/api/admin/admission", None),
+    ("GET", "/api/admin/bookings/export", "bulk"),
+    ("POST", "/api/admin/bookings/import", "bulk"),
+    ("GET", "/api/admin/exports/abc/download", "bulk"),
+    ("POST", "/api/admin/exports", "admin"),
+    ("GET", "/api/admin/exports/abc", "admin"),
+    ("GET", "/api/admin/bookings", "admin"),
+    ("GET", "/api/health", None),
+    ("GET", "/", None),
+])
+def test_classify_request(method, path, expected):
+    assert classify_request(method, path) == expected
+
+
+def test_login_checks_password_off_the_event_loop(server, client, monkeypatch):
+    calls = []
+    loop_threads = []
+
+    class FakeAdmins:
+        async def find_by_username(self, username):
+            loop_threads.append(threading.current_thread())
+            return {"username": username, "password_hash": "hash"}
+
+    class FakeBcrypt:
+        @staticmethod
+        def checkpw(password, hashed):
+            calls.append(threading.current_thread())
+            return False
+
+    monkeypatch.setattr(server.storage, "admins", FakeAdmins())
+    monkeypatch.setattr(server, "bcrypt", FakeBcrypt)
+    resp = client.post("/api/admin/login", json={"username": "admin", "password": "wrong"})
+
+    assert resp.status_code == 401
+    assert calls and calls[0] is not loop_threads[0]
+
+
+def test_legacy_export_builds_csv_with_fixed_columns(server, storage, admin_client):
+    asyncio.run(storage.bookings.insert({"id": "a", "full_name": "Old", "created_at": "2026-01-01T00:00:00+00:00"}))
+    asyncio.run(storage.bookings.insert({"id": "b", "full_name": "Imported", "source": "import",
+                                         "created_at": "2026-01-02T00:00:00+00:00"}))
+    resp = admin_client.get("/api/admin/bookings/export")
+
+    assert resp.status_code == 200
+    lines = resp.text.splitlines()
+    assert lines[0] == ",".join(server.EXPORT_FIELDS)
+    assert len(lines) == 3
@@ -0,0 +1,206 @@
+import asyncio
+
+import pytest
+
+import server
+from server import RecentBookingsCache, TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(server.time, "monotonic", clock)
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+
+    clock.now += 4
+    assert cache.get("a") == 1
+    clock.now += 1
+    assert cache.get("a", ...) is ...
+    assert "a" not in cache.data
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_ttl_cache_stores_none():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("missing", None)
+    assert cache.get("missing", ...) is None
+    cache.invalidate("missing")
+    assert cache.get("missing", ...) is ...
+
+
+class FakeRequest:
+    headers = {}
+    client = None
+
+
+class FlakyBookings:
+    def __init__(self, error=None, doc=None):
+        self.error = error
+        self.doc = doc
+        self.calls = 0
+
+    async def get(self, booking_id, fields):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        return self.doc
+
+
+@pytest.fixture
+def status(server, monkeypatch):
+    monkeypatch.setattr(server, "status_cache", TTLCache(100, 60))
+    monkeypatch.setattr(server, "_status_lookups", {})
+    monkeypatch.setattr(server, "recent_bookings", RecentBookingsCache(10))
+    server.status_rate_limit_store.clear()
+    return server
+
+
+def use_bookings(server, monkeypatch, bookings):
+    monkeypatch.setattr(server.storage, "bookings", bookings)
+
+
+def test_storage_error_is_503_and_not_cached(status, client, monkeypatch):
+    bookings = FlakyBookings(error=TimeoutError("db down"))
+    use_bookings(status, monkeypatch, bookings)
+
+    resp = client.get("/api/bookings/abc/status")
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
+    assert "abc" not in status.status_cache.data
+    assert not status._status_lookups
+
+    bookings.error = None
+    bookings.doc = {"status": "New", "created_at": "2026-01-01T00:00:00+00:00"}
+    resp = client.get("/api/bookings/abc/status")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "New"
+    assert bookings.calls == 2
+
+
+def test_found_and_unknown_ids_are_cached(status, client, monkeypatch):
+    bookings = FlakyBookings(doc=None)
+    use_bookings(status, monkeypatch, bookings)
+
+    assert client.get("/api/bookings/nope/status").status_code == 404
+    assert client.get("/api/bookings/nope/status").status_code == 404
+    assert bookings.calls == 1
+
+
+def test_concurrent_pollers_share_one_read(status, monkeypatch):
+    bookings = FlakyBookings(doc={"status": "Contacted"})
+    use_bookings(status, monkeypatch, bookings)
+
+    async def poll_many():
+        return await asyncio.gather(*(
+            status.get_booking_status("abc", FakeRequest()) for _ in range(5)
+        ))
+
+    results = asyncio.run(poll_many())
+    assert all(r["status"] == "Contacted" for r in results)
+    assert bookings.calls == 1
+
+
+def test_write_during_lookup_is_not_cached(status, monkeypatch):
+    bookings = FlakyBookings(doc={"status": "New"})
+    use_bookings(status, monkeypatch, bookings)
+
+    async def poll_with_write():
+        poll = asyncio.create_task(status.get_booking_status("abc", FakeRequest()))
+        await asyncio.sleep(0)
+        status.invalidate_booking_status("abc")
+        return await poll
+
+    assert asyncio.run(poll_with_write())["status"] == "New"
+    assert "abc" not in status.status_cache.data
+
+
+def test_cancelled_poller_caches_nothing_bogus(status, monkeypatch):
+    bookings = FlakyBookings(doc={"status": "New"})
+    use_bookings(status, monkeypatch, bookings)
+
+    async def cancel_poll():
+        poll = asyncio.create_task(status.get_booking_status("abc", FakeRequest()))
+        await asyncio.sleep(0)
+        poll.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await poll
+        # The shared read still finishes and caches the real result
+        await asyncio.sleep(0.01)
+
+    asyncio.run(cancel_poll())
+    assert status.status_cache.get("abc", ...) == {"status": "New"}
+
+
+def test_rate_limit_store_sweeps_idle_keys(status, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(status.time, "time", clock)
+    store = status.RateLimitStore()
+    store.last_sweep = clock.now
+
+    for n in range(3):
+        assert status.check_rate_limit(f"198.51.100.{n}", store, limit=2, window=60)
+    clock.now += 30
+    assert status.check_rate_limit("198.51.100.0", store, limit=2, window=60)
+    clock.now += 40
+    assert status.check_rate_limit("203.0.113.9", store, limit=2, window=60)
+
+    # Only keys with a hit in the last window survive the sweep
+    assert set(store) == {"198.51.100.0", "203.0.113.9"}
+
+
+class WriteThenTimeout:
+    """Bookings store whose first insert lands but reports a timeout"""
+
+    def __init__(self, store):
+        self.store = store
+        self.inserts = 0
+
+    async def insert(self, booking):
+        self.inserts += 1
+        await self.store.insert(booking)
+        if self.inserts == 1:
+            raise TimeoutError("write acknowledged too late")
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+
+def test_booking_written_by_a_timed_out_attempt_counts_as_saved(server, storage, live_admin_client, monkeypatch):
+    bookings = WriteThenTimeout(storage.bookings)
+    monkeypatch.setattr(storage, "bookings", bookings)
+    emailed = []
+    monkeypatch.setattr(server, "send_booking_emails", lambda booking: emailed.append(booking["id"]) or asyncio.sleep(0))
+    monkeypatch.setattr(server, "status_cache", TTLCache(100, 60))
+    server.status_rate_limit_store.clear()
+
+    booking_id = live_admin_client.post("/api/bookings", json={
+        "full_name": "Ana",
+        "email": "ana@example.com",
+        "phone": "+15551234567",
+        "service": "Website Development",
+        "project_description": "Landing page",
+    }).json()["booking_id"]
+
+    assert bookings.inserts == 1
+    assert emailed == [booking_id]
+    assert booking_id in server.recent_bookings.entries
+    assert live_admin_client.get(f"/api/bookings/{booking_id}/status").json()["status"] == "New"
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+BOOKINGS = [
+    ("b1", "Website Development", "New"),
+    ("b2", "Website Development", "Contacted"),
+    ("b3", "Video Editing", "New"),
+    ("b4", "Graphic Design", "Completed"),
+    ("b5", "Video Editing", "In Progress"),
+]
+
+
+@pytest.fixture(params=["cold", "warm"])
+def dashboard(request, server, storage, admin_client, monkeypatch):
+    """Admin client over seeded bookings, with the recent cache cold or warm"""
+    async def seed():
+        for n, (booking_id, service, status) in enumerate(BOOKINGS):
+            await storage.bookings.insert({
+                "id": booking_id,
+                "full_name": f"Client {n}",
+                "email": f"client{n}@example.com",
+                "service": service,
+                "status": status,
+                "created_at": f"2026-01-0{n + 1}T00:00:00+00:00",
+            })
+        cache = server.RecentBookingsCache(100)
+        if request.param == "warm":
+            await cache.warm(storage.bookings)
+        return cache
+
+    monkeypatch.setattr(server, "recent_bookings", asyncio.run(seed()))
+    return admin_client
+
+
+def test_dashboard_stats_and_facets(dashboard):
+    body = dashboard.get("/api/admin/dashboard").json()
+
+    assert body["stats"] == {
+        "total": 5,
+        "new": 2,
+        "contacted": 1,
+        "in_progress": 1,
+        "completed": 1,
+        "by_service": {"Website Development": 2, "Video Editing": 2, "Graphic Design": 1},
+    }
+    assert body["facets"]["services"] == [
+        {"value": "Graphic Design", "count": 1},
+        {"value": "Video Editing", "count": 2},
+        {"value": "Website Development", "count": 2},
+    ]
+    assert {f["value"]: f["count"] for f in body["facets"]["statuses"]} == {
+        "New": 2, "Contacted": 1, "In Progress": 1, "Completed": 1,
+    }
+    assert [b["id"] for b in body["bookings"]] == ["b5", "b4", "b3", "b2", "b1"]
+    assert body["total"] == 5
+
+
+def test_dashboard_filters_bookings_but_not_stats(dashboard):
+    body = dashboard.get("/api/admin/dashboard", params={"service": "Video Editing", "status": "New"}).json()
+
+    assert [b["id"] for b in body["bookings"]] == ["b3"]
+    assert body["stats"]["total"] == 5
+
+
+@pytest.mark.parametrize("limit, expected", [(2, 2), (0, 1), (-5, 1), (100000, 5)])
+def test_dashboard_clamps_limit(dashboard, limit, expected):
+    body = dashboard.get("/api/admin/dashboard", params={"limit": limit}).json()
+    assert body["total"] == expected
+    assert len(body["bookings"]) == expected
+
+
+def test_stats_endpoint_matches_dashboard(dashboard):
+    assert dashboard.get("/api/admin/stats").json() == dashboard.get("/api/admin/dashboard").json()["stats"]
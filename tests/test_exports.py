@@ -0,0 +1,129 @@
+import asyncio
+import csv
+import io
+import threading
+import time
+
+import pytest
+
+from server import _parse_range, to_utc_isoformat
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2026-01-02T03:04:05+00:00", "2026-01-02T03:04:05+00:00"),
+    ("2026-01-02T03:04:05Z", "2026-01-02T03:04:05+00:00"),
+    ("2026-01-02T05:04:05+02:00", "2026-01-02T03:04:05+00:00"),
+    ("2026-01-02T03:04:05", "2026-01-02T03:04:05+00:00"),
+])
+def test_to_utc_isoformat(value, expected):
+    assert to_utc_isoformat(value) == expected
+
+
+def test_to_utc_isoformat_rejects_garbage():
+    with pytest.raises(ValueError):
+        to_utc_isoformat("garbage")
+
+
+def test_create_export_rejects_invalid_since(admin_client):
+    resp = admin_client.post("/api/admin/exports", json={"since": "garbage"})
+    assert resp.status_code == 400
+
+
+def test_create_export_normalizes_since(admin_client):
+    resp = admin_client.post("/api/admin/exports", json={"since": "2026-01-02T05:04:05+02:00"})
+    assert resp.status_code == 200
+    assert resp.json()["since"] == "2026-01-02T03:04:05+00:00"
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=-100", (900, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=-5000", (0, 999)),
+    ("bytes=1000-", None),
+    ("bytes=5-1", None),
+    ("bytes=0-1,5-9", None),
+    ("items=0-1", None),
+    ("bytes=abc-", None),
+])
+def test_parse_range(header, expected):
+    assert _parse_range(header, 1000) == expected
+
+
+def run_export(client, since=None) -> tuple:
+    job = client.post("/api/admin/exports", json={"since": since}).json()
+    for _ in range(200):
+        job = client.get(f"/api/admin/exports/{job['id']}").json()
+        if job["status"] in ("completed", "failed"):
+            break
+        time.sleep(0.01)
+    assert job["status"] == "completed", job
+    rows = list(csv.DictReader(io.StringIO(client.get(f"/api/admin/exports/{job['id']}/download").text)))
+    return job, rows
+
+
+def booking_body(n: int) -> dict:
+    return {
+        "full_name": f"Client {n}",
+        "email": f"client{n}@example.com",
+        "phone": "+15551234567",
+        "service": "Website Development",
+        "project_deadline": "2026-12-31",
+        "project_description": f"Landing page number {n}",
+    }
+
+
+def test_delta_exports_follow_every_write(server, live_admin_client, monkeypatch):
+    client = live_admin_client
+    monkeypatch.setattr(server, "send_booking_emails", lambda booking: asyncio.sleep(0))
+    ids = [client.post("/api/bookings", json=booking_body(n)).json()["booking_id"] for n in range(2)]
+
+    full, rows = run_export(client)
+    assert sorted(r["id"] for r in rows) == sorted(ids)
+    assert full["cursor"]
+
+    # An import keeps its historical created_at but is still a new write
+    legacy = ("id,full_name,email,phone,service,project_description,created_at\n"
+              "legacy-1,Old Lead,old@example.com,+15550000000,Video Editing,Promo video,2020-01-01T00:00:00Z\n")
+    client.post("/api/admin/bookings/import?format=csv", content=legacy)
+    client.put(f"/api/admin/bookings/{ids[0]}/status", json={"status": "Contacted"})
+
+    delta, rows = run_export(client, since=full["cursor"])
+    assert sorted(r["id"] for r in rows) == sorted(["legacy-1", ids[0]])
+    assert delta["cursor"] > full["cursor"]
+
+    empty, rows = run_export(client, since=delta["cursor"])
+    assert rows == []
+    assert empty["cursor"] == delta["cursor"]
+
+
+def test_export_jobs_hold_the_bulk_gate(server, live_admin_client, storage, monkeypatch):
+    client = live_admin_client
+    gate = server.AdmissionGate("bulk", limit=1, max_queue=0, timeout=0.1)
+    monkeypatch.setitem(server.admission_gates, "bulk", gate)
+    release = threading.Event()
+
+    async def slow_count(since):
+        await asyncio.to_thread(release.wait, 5)
+        return 0
+    monkeypatch.setattr(storage.bookings, "count_changed_since", slow_count)
+
+    job = client.post("/api/admin/exports", json={}).json()
+    assert gate.active == 1
+
+    # Another job and the legacy export are both shed while the first runs
+    resp = client.post("/api/admin/exports", json={})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+    assert client.get("/api/admin/bookings/export").status_code == 503
+    assert gate.shed == 2
+    # Polling the running job is not bulk work
+    assert client.get(f"/api/admin/exports/{job['id']}").status_code == 200
+
+    release.set()
+    for _ in range(200):
+        if client.get(f"/api/admin/exports/{job['id']}").json()["status"] == "completed":
+            break
+        time.sleep(0.01)
+    assert gate.active == 0
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+
+from server import FrontendBuild, parse_accept_encoding
+
+
+@pytest.fixture
+def build(tmp_path):
+    (tmp_path / "static").mkdir()
+    for name in ("main.js", "main.js.br", "main.js.gz"):
+        (tmp_path / "static" / name).write_bytes(b"x")
+    (tmp_path / "index.html").write_bytes(b"<html></html>")
+    return FrontendBuild(tmp_path)
+
+
+def serve(build, accept_encoding):
+    request = SimpleNamespace(headers={"accept-encoding": accept_encoding})
+    file = build.resolve("static/main.js")
+    return build.serve_file(file, request, "no-cache")
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, deflate;q=0.5, br;q=0") == {"gzip": 1.0, "deflate": 0.5, "br": 0.0}
+    assert parse_accept_encoding("") == {}
+    assert parse_accept_encoding("GZIP;Q=0.3, *;q=bad") == {"gzip": 0.3, "*": 0.0}
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=1, br;q=0.5", "gzip"),
+    ("*", "br"),
+    ("*, br;q=0", "gzip"),
+    ("", None),
+])
+def test_serve_file_negotiates_encoding(build, accept_encoding, expected):
+    resp = serve(build, accept_encoding)
+    assert resp.headers.get("content-encoding") == expected
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.media_type in ("text/javascript", "application/javascript")
+
+
+def test_resolve_rejects_paths_outside_the_build(build):
+    assert build.resolve("../etc/passwd") is None
+    assert build.resolve("static/missing.js") is None
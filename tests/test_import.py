@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import server
+from server import ImportRowError, import_row_to_booking, iter_import_records
+
+
+class StreamedBody:
+    """Request stand-in that streams its body in fixed-size chunks"""
+
+    def __init__(self, body: bytes, chunk_size: int = 7):
+        self.body = body
+        self.chunk_size = chunk_size
+
+    async def stream(self):
+        for i in range(0, len(self.body), self.chunk_size):
+            yield self.body[i:i + self.chunk_size]
+
+
+def records(body: str, fmt: str, chunk_size: int = 7):
+    async def collect():
+        return [r async for r in iter_import_records(StreamedBody(body.encode("utf-8"), chunk_size), fmt)]
+    return asyncio.run(collect())
+
+
+def test_csv_quoted_field_spans_lines():
+    body = 'full_name,project_description\r\nJosé,"Line one\nline two, with ""quotes"""\r\nAna,Short\n'
+    rows = records(body, "csv")
+
+    assert rows == [
+        (1, {"full_name": "José", "project_description": 'Line one\nline two, with "quotes"'}),
+        (2, {"full_name": "Ana", "project_description": "Short"}),
+    ]
+
+
+def test_csv_without_trailing_newline_and_with_bom():
+    rows = records("\ufefffull_name,email\nAna,ana@example.com", "csv")
+    assert rows == [(1, {"full_name": "Ana", "email": "ana@example.com"})]
+
+
+def test_ndjson_reports_bad_rows_and_continues():
+    rows = records('{"full_name": "Ana"}\n\nnot json\n[1, 2]\n{"full_name": "Bo"}\n', "ndjson")
+
+    assert rows[0] == (1, {"full_name": "Ana"})
+    assert isinstance(rows[1][1], ImportRowError) and rows[1][0] == 2
+    assert isinstance(rows[2][1], ImportRowError) and rows[2][0] == 3
+    assert rows[3] == (4, {"full_name": "Bo"})
+
+
+def test_oversize_record_is_rejected_not_buffered(monkeypatch):
+    monkeypatch.setattr(server, "IMPORT_MAX_RECORD_BYTES", 32)
+    rows = records('{"full_name": "Ana"}\n{"full_name": "' + "x" * 40 + '"}\n', "ndjson", chunk_size=1024)
+
+    assert rows[0] == (1, {"full_name": "Ana"})
+    assert isinstance(rows[1][1], ImportRowError)
+
+
+def test_oversize_line_aborts_the_import(monkeypatch):
+    monkeypatch.setattr(server, "IMPORT_MAX_RECORD_BYTES", 32)
+    with pytest.raises(HTTPException):
+        records("x" * 100, "ndjson", chunk_size=10)
+
+
+def test_unterminated_csv_quote_aborts_the_import(monkeypatch):
+    monkeypatch.setattr(server, "IMPORT_MAX_RECORD_BYTES", 32)
+    with pytest.raises(HTTPException):
+        records('full_name\n"open quote\n' + "more\n" * 20, "csv")
+
+
+def test_import_row_to_booking_normalizes_timestamps():
+    booking = import_row_to_booking({
+        "id": "legacy-1",
+        "full_name": "Ana",
+        "email": "ana@example.com",
+        "phone": "+15551234567",
+        "service": "Website Development",
+        "project_description": "Landing page",
+        "status": "Contacted",
+        "created_at": "2025-06-01T12:00:00Z",
+        "ip_address": "203.0.113.5",
+    })
+
+    assert booking["id"] == "legacy-1"
+    assert booking["status"] == "Contacted"
+    assert booking["created_at"] == "2025-06-01T12:00:00+00:00"
+    assert booking["source"] == "import"
+
+
+def test_import_row_to_booking_rejects_missing_fields():
+    with pytest.raises(ImportRowError):
+        import_row_to_booking({"full_name": "Ana", "service": "Website Development"})
+
+
+LEAD = {
+    "full_name": "Ana",
+    "email": "ana@example.com",
+    "phone": "+15551234567",
+    "service": "Website Development",
+    "project_description": "Landing page",
+}
+
+
+def test_import_row_without_id_gets_a_stable_id():
+    row = {**LEAD, "created_at": "2025-06-01T12:00:00Z"}
+    first, again = import_row_to_booking(dict(row)), import_row_to_booking(dict(row))
+    other = import_row_to_booking({**row, "email": "bo@example.com"})
+
+    assert first["id"] == again["id"]
+    assert first["id"] != other["id"]
+
+
+def test_import_row_without_created_at_is_rejected():
+    with pytest.raises(ImportRowError, match="created_at"):
+        import_row_to_booking({**LEAD, "id": "legacy-1"})
+
+
+def test_reimporting_rows_without_ids_does_not_duplicate(admin_client, storage):
+    body = ("full_name,email,phone,service,project_description,created_at\n"
+            "Ana,ana@example.com,+15551234567,Video Editing,Promo,2025-06-01T12:00:00Z\n")
+
+    first = admin_client.post("/api/admin/bookings/import?format=csv", content=body).json()
+    again = admin_client.post("/api/admin/bookings/import?format=csv", content=body).json()
+
+    assert (first["inserted"], again["inserted"], again["skipped"]) == (1, 0, 1)
+    assert len(asyncio.run(storage.bookings.list(limit=10))) == 1
+
+
+def test_aborted_import_reports_what_was_committed(admin_client, storage, monkeypatch):
+    monkeypatch.setattr(server, "IMPORT_BATCH_SIZE", 1)
+    monkeypatch.setattr(server, "IMPORT_MAX_RECORD_BYTES", 256)
+    rows = [
+        '{"id": "a%d", "full_name": "Ana", "email": "ana%d@example.com", "phone": "+15551234567", '
+        '"service": "Video Editing", "project_description": "Promo", "created_at": "2025-06-01T12:00:00Z"}' % (n, n)
+        for n in range(2)
+    ]
+    body = "\n".join(rows) + "\n" + "x" * 1000
+
+    resp = admin_client.post("/api/admin/bookings/import?format=ndjson", content=body)
+
+    assert resp.status_code == 400
+    result = resp.json()
+    assert result["status"] == "aborted"
+    assert result["detail"] == "Line too long"
+    assert result["inserted"] == 2
+    assert result["aborted_after_row"] == 2
+    assert len(asyncio.run(storage.bookings.list(limit=10))) == 2
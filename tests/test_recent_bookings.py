@@ -0,0 +1,104 @@
+import asyncio
+
+from server import RecentBookingsCache
+
+
+def booking(n: int, service: str = "Website Development", status: str = "New") -> dict:
+    return {
+        "id": f"b{n}",
+        "created_at": f"2026-01-01T00:00:{n:02d}+00:00",
+        "service": service,
+        "status": status,
+        "ip_address": "203.0.113.5",
+    }
+
+
+class ListStore:
+    """BookingStore stand-in that can hold list() open while writes land"""
+
+    def __init__(self, docs, gate=None):
+        self.docs = docs
+        self.gate = gate
+
+    async def list(self, service=None, status=None, limit=None):
+        if self.gate is not None:
+            await self.gate.wait()
+        docs = sorted(self.docs, key=lambda d: d["created_at"], reverse=True)
+        return [dict(d) for d in docs[:limit]]
+
+
+def warmed(capacity: int, docs) -> RecentBookingsCache:
+    cache = RecentBookingsCache(capacity)
+    asyncio.run(cache.warm(ListStore(docs)))
+    return cache
+
+
+def test_not_ready_until_warmed():
+    cache = RecentBookingsCache(10)
+    assert cache.query(None, None, 5) is None
+    assert cache.misses == 1
+
+
+def test_complete_cache_answers_every_query():
+    cache = warmed(10, [booking(1), booking(2, service="App Development"), booking(3)])
+
+    assert cache.complete
+    assert [d["id"] for d in cache.query(None, None, 10)] == ["b3", "b2", "b1"]
+    assert [d["id"] for d in cache.query("Website Development", None, 10)] == ["b3", "b1"]
+    assert "ip_address" not in cache.query(None, None, 1)[0]
+
+
+def test_partial_window_misses_short_pages():
+    cache = warmed(3, [booking(n) for n in range(1, 6)])
+
+    assert not cache.complete
+    assert cache.window_start == booking(3)["created_at"]
+    assert [d["id"] for d in cache.query(None, None, 2)] == ["b5", "b4"]
+    # Only three cached; older matches may be in the DB
+    assert cache.query(None, None, 5) is None
+    assert cache.query("App Development", None, 5) is None
+
+
+def test_eviction_moves_the_window_forward():
+    cache = warmed(3, [booking(1), booking(2)])
+    assert cache.complete
+
+    cache.add(booking(3))
+    assert cache.complete
+    cache.add(booking(4))
+    assert not cache.complete
+    assert "b1" not in cache.entries
+    assert cache.window_start == booking(2)["created_at"]
+
+    # Older than the window: not cached
+    cache.add(booking(0))
+    assert "b0" not in cache.entries
+
+
+def test_update_reindexes_status():
+    cache = warmed(10, [booking(1), booking(2)])
+    cache.update("b1", {"status": "Contacted"})
+
+    assert [d["id"] for d in cache.query(None, "Contacted", 10)] == ["b1"]
+    assert [d["id"] for d in cache.query(None, "New", 10)] == ["b2"]
+
+
+def test_writes_during_warm_are_replayed():
+    async def scenario():
+        gate = asyncio.Event()
+        store = ListStore([booking(1), booking(2), booking(3)], gate)
+        cache = RecentBookingsCache(10)
+        warming = asyncio.create_task(cache.warm(store))
+        await asyncio.sleep(0)
+
+        # The DB read already happened from the cache's point of view
+        cache.update("b1", {"status": "Completed"})
+        cache.remove("b2")
+        cache.add(booking(4))
+        gate.set()
+        await warming
+        return cache
+
+    cache = asyncio.run(scenario())
+    assert [d["id"] for d in cache.query(None, None, 10)] == ["b4", "b3", "b1"]
+    assert cache.entries["b1"]["status"] == "Completed"
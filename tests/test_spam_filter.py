@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from server import BloomFilter, BookingCreate
+
+
+def make_booking(description: str, email: str = "client@acme.com") -> BookingCreate:
+    return BookingCreate(
+        full_name="Jane Client",
+        email=email,
+        phone="+15551234567",
+        service="Website Development",
+        project_deadline="2026-12-31",
+        project_description=description,
+    )
+
+
+@pytest.fixture
+def spam(server, monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "SPAM_BLOCKLIST_PATH", tmp_path / "blocklist.txt")
+    monkeypatch.setattr(server, "_spam_filter", None)
+    monkeypatch.setattr(server, "spam_blocklist", set())
+    monkeypatch.setattr(server, "ip_reputation", {})
+    monkeypatch.setattr(server, "recent_descriptions", {})
+    return server
+
+
+def test_bloom_filter_membership():
+    bloom = BloomFilter(1000, 0.001)
+    assert bloom.add("email:spam@example.com")
+    assert not bloom.add("email:spam@example.com")
+    assert "email:spam@example.com" in bloom
+    assert "email:client@acme.com" not in bloom
+
+
+def test_blocklist_persists_and_entries_can_be_removed(spam):
+    keys = ["email:spam@example.com", "domain:spam.example"]
+    assert asyncio.run(spam.add_to_blocklist(keys)) == 2
+    assert asyncio.run(spam.add_to_blocklist(keys[:1])) == 0
+    assert spam.SPAM_BLOCKLIST_PATH.read_text().splitlines() == sorted(keys)
+
+    # A fresh process rebuilds the filter from the file
+    spam.load_spam_filter()
+    assert spam.early_spam_check(make_booking("Hello", email="x@spam.example"), "203.0.113.5") == "blocklist"
+
+    assert asyncio.run(spam.remove_from_blocklist(["domain:spam.example"])) == 1
+    assert spam.early_spam_check(make_booking("Hello", email="x@spam.example"), "203.0.113.5") is None
+    assert spam.SPAM_BLOCKLIST_PATH.read_text().splitlines() == ["email:spam@example.com"]
+
+
+def test_blocklist_file_ignores_ip_entries(spam):
+    spam.SPAM_BLOCKLIST_PATH.write_text("ip:203.0.113.5\nemail:spam@example.com\n\n")
+    spam.load_spam_filter()
+    assert spam.spam_blocklist == {"email:spam@example.com"}
+
+
+@pytest.mark.parametrize("description", [
+    "Please redesign our site https://www.acme.com",
+    "Redesign www.acme.com",
+    "Like https://a.com, http://b.com and www.c.com but for https://www.acme.com/shop",
+])
+def test_client_links_are_accepted(spam, description):
+    assert spam.early_spam_check(make_booking(description), "203.0.113.5") is None
+
+
+def test_link_dump_is_rejected(spam):
+    links = " ".join(f"https://site{i}.example" for i in range(spam.MAX_LINKS + 1))
+    assert spam.early_spam_check(make_booking(links), "203.0.113.5") == "too_many_links"
+
+
+def test_blocklisted_email_is_rejected(spam):
+    spam.get_spam_filter().add("email:spam@example.com")
+    assert spam.early_spam_check(make_booking("Hello", email="Spam@Example.com"), "203.0.113.5") == "blocklist"
+
+
+def test_ip_reputation_is_rejected(spam):
+    spam.penalize_ip("203.0.113.5", spam.SPAM_SCORE_THRESHOLD)
+    assert spam.early_spam_check(make_booking("Hello"), "203.0.113.5") == "ip_reputation"
+    assert spam.early_spam_check(make_booking("Hello"), "203.0.113.6") is None
+
+
+def test_unaccepted_descriptions_are_not_counted(spam):
+    booking = make_booking("We need a new landing page for our bakery")
+    for _ in range(spam.DUPLICATE_MAX + 2):
+        assert spam.early_spam_check(booking, "203.0.113.5") is None
+
+
+def test_client_retries_are_accepted(spam):
+    text = "We need a new landing page for our bakery"
+    for _ in range(4):
+        assert spam.early_spam_check(make_booking(text), "203.0.113.5") is None
+        spam.record_description(text, "client@acme.com")
+
+
+def test_duplicates_counted_per_sender(spam):
+    text = "We need a new landing page for our bakery"
+    for _ in range(spam.DUPLICATE_MAX):
+        spam.record_description(text, "bot@example.com")
+
+    assert spam.early_spam_check(make_booking(text, email="bot@example.com"), "203.0.113.5") == "duplicate_description"
+    assert spam.early_spam_check(make_booking(text, email="other@example.com"), "203.0.113.5") is None
+
+
+def test_rotating_sender_emails_are_counted_together(spam):
+    text = "Cheap SEO backlinks for your business today"
+    for n in range(spam.DUPLICATE_MAX_SENDERS):
+        spam.record_description(text, f"bot{n}@example.com")
+
+    assert spam.early_spam_check(make_booking(text, email="bot99@example.com"), "203.0.113.5") == "duplicate_description"
+    # One of the earlier senders retrying is still a retry
+    assert spam.early_spam_check(make_booking(text, email="bot0@example.com"), "203.0.113.5") is None
+
+
+def test_spam_delete_blocklists_email_but_not_ip(spam, storage, admin_client):
+    booking = {"id": "s1", "email": "Spam@Example.com", "ip_address": "198.51.100.7",
+               "created_at": "2026-01-01T00:00:00+00:00"}
+    asyncio.run(storage.bookings.insert(booking))
+    resp = admin_client.post("/api/admin/bookings/bulk-delete", json={"ids": ["s1"], "spam": True})
+
+    assert resp.status_code == 200
+    assert spam.spam_blocklist == {"email:spam@example.com"}
+    assert spam.get_ip_reputation("198.51.100.7") == spam.SPAM_SCORE_THRESHOLD
+
+    resp = admin_client.post("/api/admin/spam/blocklist/remove",
+                             json={"emails": ["spam@example.com"], "ips": ["198.51.100.7"]})
+    assert resp.json()["removed"] == 1
+    assert spam.get_ip_reputation("198.51.100.7") == 0
+    assert spam.early_spam_check(make_booking("Hello", email="spam@example.com"), "198.51.100.7") is None
+
+
+def test_honeypot_does_not_penalize_forwarded_ip(spam, client):
+    body = make_booking("Hello").dict()
+    body["company_url"] = "http://bot.example"
+    resp = client.post("/api/bookings", json=body, headers={"X-Forwarded-For": "198.51.100.9"})
+
+    assert resp.status_code == 400
+    assert spam.get_ip_reputation("198.51.100.9") == 0
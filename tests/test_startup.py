@@ -0,0 +1,70 @@
+import asyncio
+from types import SimpleNamespace
+
+
+def test_startup_tasks_report_their_own_run_time(server, storage, monkeypatch):
+    async def slow_seed():
+        await asyncio.sleep(0.05)
+
+    monkeypatch.setattr(server, "seed_admin", slow_seed)
+    monkeypatch.setattr(server, "startup_tasks", {})
+    monkeypatch.setattr(server, "startup_timings", {})
+    monkeypatch.setattr(server, "recent_bookings", server.RecentBookingsCache(10))
+
+    async def start():
+        await server.schedule_startup_tasks()
+        await asyncio.gather(*server.startup_tasks.values())
+
+    asyncio.run(start())
+    assert set(server.startup_timings) == {"warm_sanitizer", "slow_seed", "ensure_indexes", "warm_recent_bookings"}
+    assert server.startup_timings["slow_seed"] >= 50
+    # Ran alongside the slow task, not after it
+    assert server.startup_timings["ensure_indexes"] < 50
+    assert server.startup_tasks["warm_sanitizer"].done()
+
+
+def test_recent_bookings_warm_up_retries_with_backoff(server, monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    class FlakyStore:
+        calls = 0
+
+        async def list(self, limit):
+            self.calls += 1
+            if self.calls < 3:
+                raise ConnectionError("database is starting up")
+            return [{"id": "b1", "created_at": "2026-01-01T00:00:00+00:00"}]
+
+    store = FlakyStore()
+    monkeypatch.setattr(server, "storage", SimpleNamespace(bookings=store))
+    monkeypatch.setattr(server, "recent_bookings", server.RecentBookingsCache(10))
+    monkeypatch.setattr(server.asyncio, "sleep", fake_sleep)
+
+    asyncio.run(server.warm_recent_bookings())
+    assert store.calls == 3
+    assert sleeps == [1.0, 2.0]
+    assert server.recent_bookings.ready
+
+
+def test_recent_bookings_warm_up_gives_up(server, monkeypatch):
+    class DownStore:
+        calls = 0
+
+        async def list(self, limit):
+            self.calls += 1
+            raise ConnectionError("database is down")
+
+    async def no_sleep(delay):
+        pass
+
+    store = DownStore()
+    monkeypatch.setattr(server, "storage", SimpleNamespace(bookings=store))
+    monkeypatch.setattr(server, "recent_bookings", server.RecentBookingsCache(10))
+    monkeypatch.setattr(server.asyncio, "sleep", no_sleep)
+
+    asyncio.run(server.warm_recent_bookings())
+    assert store.calls == server.RECENT_CACHE_WARM_ATTEMPTS
+    assert not server.recent_bookings.ready
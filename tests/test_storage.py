@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from storage import AdminStore, BookingStore, MongoBookingStore, MongoStorage, SQLiteStorage, open_storage
+
+
+def booking(n: int, **fields) -> dict:
+    doc = {
+        "id": f"b{n}",
+        "email": f"user{n}@example.com",
+        "service": "Website Development",
+        "status": "New",
+        "created_at": f"2026-01-01T00:00:{n:02d}+00:00",
+        "ip_address": "203.0.113.5",
+    }
+    doc.update(fields)
+    return doc
+
+
+def test_incomplete_store_fails_at_construction():
+    class PartialStore(BookingStore):
+        async def insert(self, booking):
+            pass
+
+    with pytest.raises(TypeError, match="abstract"):
+        PartialStore()
+    with pytest.raises(TypeError):
+        AdminStore()
+
+
+def test_engines_implement_the_interfaces():
+    for storage in (SQLiteStorage(":memory:"), MongoStorage("mongodb://localhost:1", "test")):
+        assert isinstance(storage.bookings, BookingStore)
+        assert isinstance(storage.admins, AdminStore)
+
+
+def test_open_storage_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        open_storage("postgres")
+
+
+def test_sqlite_booking_store_round_trip():
+    async def scenario():
+        storage = SQLiteStorage(":memory:")
+        store = storage.bookings
+        await store.ensure_indexes()
+        await store.insert(booking(1))
+        second = booking(2, service="App Development")
+        await store.insert(second)
+        inserted = await store.insert_many([booking(2), booking(3)])
+        await store.update("b1", {"status": "Contacted", "updated_at": "2026-01-02T00:00:00+00:00"})
+
+        result = {
+            "inserted": [d["id"] for d in inserted],
+            "list": [d["id"] for d in await store.list()],
+            "by_service": [d["id"] for d in await store.list(service="Website Development")],
+            "count": await store.count(status="New"),
+            "get": await store.get("b1", ("status",)),
+            # Writes after b2, in write order: b3 inserted, then b1 updated
+            "changed": [d["id"] async for d in store.iter_changed_since(second["modified_at"])],
+            "deleted": await store.delete_many(["b2", "b3", "missing"]),
+            "remaining": await store.count(),
+        }
+        await storage.close()
+        return result
+
+    result = asyncio.run(scenario())
+    assert result["inserted"] == ["b3"]
+    assert result["list"] == ["b3", "b2", "b1"]
+    assert result["by_service"] == ["b3", "b1"]
+    assert result["count"] == 2
+    assert result["get"] == {"status": "Contacted"}
+    assert result["changed"] == ["b3", "b1"]
+    assert result["deleted"] == 2
+    assert result["remaining"] == 1
+
+
+def test_sqlite_list_omits_ip_address():
+    async def scenario():
+        storage = SQLiteStorage(":memory:")
+        await storage.bookings.insert(booking(1))
+        docs = await storage.bookings.list()
+        await storage.close()
+        return docs
+
+    assert "ip_address" not in asyncio.run(scenario())[0]
+
+
+def test_sqlite_migrates_modified_at(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE bookings (id TEXT PRIMARY KEY, created_at TEXT, updated_at TEXT, "
+                 "service TEXT, status TEXT, email TEXT, doc TEXT NOT NULL)")
+    conn.execute("INSERT INTO bookings VALUES ('old', '2025-01-01T00:00:00+00:00', NULL, NULL, 'New', NULL, "
+                 "'{\"id\": \"old\"}')")
+    conn.commit()
+    conn.close()
+
+    async def scenario():
+        storage = SQLiteStorage(path)
+        await storage.bookings.ensure_indexes()
+        docs = [d async for d in storage.bookings.iter_changed_since("2024-12-31T00:00:00+00:00")]
+        await storage.close()
+        return docs
+
+    assert asyncio.run(scenario()) == [{"id": "old", "modified_at": "2025-01-01T00:00:00+00:00"}]
+
+
+def test_stamps_strictly_increase():
+    storage = SQLiteStorage(":memory:")
+    stamps = [storage.stamp() for _ in range(1000)]
+    assert stamps == sorted(set(stamps))
+
+
+def test_mongo_indexes_are_created_independently(caplog):
+    class Collection:
+        def __init__(self):
+            self.indexes = []
+            self.backfilled = False
+
+        async def create_index(self, field, unique=False):
+            if unique:
+                raise RuntimeError("E11000 duplicate key error")
+            self.indexes.append(field)
+
+        async def update_many(self, query, update):
+            self.backfilled = True
+
+    col = Collection()
+    store = MongoBookingStore(SimpleNamespace(db=SimpleNamespace(bookings=col)))
+    with caplog.at_level(logging.CRITICAL, logger="storage"):
+        asyncio.run(store.ensure_indexes())
+
+    assert col.indexes == ["created_at", "updated_at", "modified_at"]
+    assert col.backfilled
+    assert "Unique index on bookings.id" in caplog.text
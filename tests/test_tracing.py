@@ -0,0 +1,94 @@
+import json
+import time
+
+import pytest
+
+from server import Trace, TraceRecorder
+
+
+def make_trace(total_ms: float, path: str = "/api/bookings") -> Trace:
+    trace = Trace("POST", path)
+    trace.total_ms = total_ms
+    return trace
+
+
+@pytest.fixture
+def recorder(server, monkeypatch, tmp_path):
+    recorder = TraceRecorder(tmp_path / "traces.jsonl", keep=5, window=3600)
+    monkeypatch.setattr(server, "trace_recorder", recorder)
+    return recorder
+
+
+def test_mark_measures_from_admission():
+    trace = Trace("POST", "/api/bookings")
+    # Pretend the request sat in the admission queue for ten seconds
+    trace.start -= 10
+    trace.mark("validation")
+
+    name, ms = trace.spans[0]
+    assert name == "validation"
+    assert ms < 1000
+
+
+def test_server_timing_lists_spans_and_total():
+    trace = Trace("GET", "/api/admin/bookings")
+    trace.add("db", 1.5)
+    trace.add("render", 0.25)
+
+    header = trace.server_timing()
+    assert header.startswith("db;dur=1.50, render;dur=0.25, total;dur=")
+
+
+def test_recorder_keeps_slowest_and_flushes(tmp_path):
+    recorder = TraceRecorder(tmp_path / "traces.jsonl", keep=2, window=3600)
+    for ms in (5, 1, 9):
+        recorder.record(make_trace(ms))
+
+    assert [t["total_ms"] for t in recorder.slowest()] == [9, 5]
+
+    recorder.flush()
+    lines = (tmp_path / "traces.jsonl").read_text().splitlines()
+    assert [json.loads(line)["total_ms"] for line in lines] == [9, 5]
+    assert [t["total_ms"] for t in recorder.last_flushed] == [9, 5]
+    assert recorder.slowest() == []
+
+
+def test_recorder_flushes_when_window_expires(tmp_path):
+    recorder = TraceRecorder(tmp_path / "traces.jsonl", keep=2, window=60)
+    recorder.record(make_trace(3))
+    recorder.window_start = time.time() - 61
+    recorder.record(make_trace(1))
+
+    assert [t["total_ms"] for t in recorder.last_flushed] == [3]
+    assert [t["total_ms"] for t in recorder.slowest()] == [1]
+
+
+def test_recorder_disabled_with_zero_keep(tmp_path):
+    recorder = TraceRecorder(tmp_path / "traces.jsonl", keep=0, window=60)
+    recorder.record(make_trace(3))
+    assert recorder.slowest() == []
+
+
+def test_server_timing_header_only_for_admins(server, client, recorder, monkeypatch):
+    monkeypatch.setattr(server, "JWT_SECRET", "test-secret-for-the-tracing-tests-only")
+
+    assert "server-timing" not in client.get("/api/health").headers
+    resp = client.get("/api/health", headers={"Authorization": "Bearer not-a-token"})
+    assert "server-timing" not in resp.headers
+
+    token = server.create_jwt("admin")
+    resp = client.get("/api/health", headers={"Authorization": f"Bearer {token}"})
+    assert "total;dur=" in resp.headers["server-timing"]
+
+
+def test_admin_traces_endpoint_reports_recorded_requests(admin_client, recorder):
+    admin_client.get("/api/health")
+    admin_client.get("/api/admin/traces")
+
+    body = admin_client.get("/api/admin/traces").json()
+    assert body["window_seconds"] == 3600
+    assert body["last_flushed"] == []
+    by_path = {t["path"]: t for t in body["current"]}
+    assert by_path["/api/health"]["status"] == 200
+    # Admin routes pass the admission gate, which shows up as its own span
+    assert "admission_wait" in [s["name"] for s in by_path["/api/admin/traces"]["spans"]]